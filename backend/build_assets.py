@@ -0,0 +1,102 @@
+"""
+Build content-hashed, precompressed static assets for production serving.
+
+    python -m backend.build_assets [out_dir]      (default: backend/dist)
+
+Every file under backend/static is copied to ``out_dir/static`` under a name
+that carries a hash of its content (``app.js`` -> ``app.3f9c2a1b7d.js``), and
+references to ``/static/...`` paths in CSS, JS, index.html and sw.js are
+rewritten to the hashed names; sw.js also gets the list of all hashed paths,
+so it can evict older builds from its cache. Text files also get ``.gz`` and,
+if brotli is installed, ``.br`` copies. A hashed URL never changes content, so
+the server can send it with an immutable, year-long Cache-Control.
+
+``manifest.json`` maps each original path to its hashed path. The server
+loads the build at startup if it exists (see backend/services/assets.py);
+otherwise it serves the unhashed sources.
+"""
+import argparse
+import hashlib
+import json
+import re
+import shutil
+from pathlib import Path
+from typing import Dict
+
+from backend.services.assets import COMPRESSIBLE, MANIFEST_FILE, ROOT_FILES
+from backend.services.response_cache import encode_bytes
+
+BACKEND_DIR = Path(__file__).resolve().parent
+STATIC_DIR = BACKEND_DIR / "static"
+
+# Absolute /static/... references (not part of a longer URL such as https://host/static/...)
+STATIC_REF_RE = re.compile(r"(?<![\w.:/])/static/[\w./-]+")
+# Files that refer to other assets are hashed after the files they refer to
+REFERRING = (".css", ".js")
+# The service worker's list of current assets, which it keeps in its cache
+SW_ASSETS_RE = re.compile(r"^const ASSETS = \[\];$", re.MULTILINE)
+
+
+def rewrite_references(text: str, manifest: Dict[str, str]) -> str:
+    """Replace /static/... paths that have a hashed build with the hashed path."""
+    return STATIC_REF_RE.sub(lambda m: manifest.get(m.group(0), m.group(0)), text)
+
+
+def _write(path: Path, body: bytes) -> None:
+    """Write a file plus precompressed copies when it is text and they are smaller."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(body)
+    if path.suffix not in COMPRESSIBLE:
+        return
+    encoded = encode_bytes(body)
+    if len(encoded.gzip) < len(body):
+        path.with_name(path.name + ".gz").write_bytes(encoded.gzip)
+    if encoded.br is not None and len(encoded.br) < len(body):
+        path.with_name(path.name + ".br").write_bytes(encoded.br)
+
+
+def build_assets(out_dir: Path) -> Dict[str, str]:
+    """Build the hashed asset tree in ``out_dir`` and return the original -> hashed manifest."""
+    if out_dir.exists():
+        shutil.rmtree(out_dir)
+    sources = sorted(path for path in STATIC_DIR.rglob("*")
+                     if path.is_file() and path.relative_to(STATIC_DIR).as_posix() not in ROOT_FILES)
+    sources.sort(key=lambda path: path.suffix in REFERRING)
+
+    manifest: Dict[str, str] = {}
+    for path in sources:
+        body = path.read_bytes()
+        if path.suffix in REFERRING:
+            body = rewrite_references(body.decode("utf-8"), manifest).encode("utf-8")
+        digest = hashlib.sha256(body).hexdigest()[:10]
+        rel = path.relative_to(STATIC_DIR)
+        hashed = rel.with_name(f"{path.stem}.{digest}{path.suffix}")
+        _write(out_dir / "static" / hashed, body)
+        manifest[f"/static/{rel.as_posix()}"] = f"/static/{hashed.as_posix()}"
+
+    # Entry points keep their URLs; only their references change
+    html = (BACKEND_DIR / "templates" / "index.html").read_text(encoding="utf-8")
+    _write(out_dir / "index.html", rewrite_references(html, manifest).encode("utf-8"))
+    for name in ROOT_FILES:
+        body = (STATIC_DIR / name).read_bytes()
+        if Path(name).suffix in REFERRING:
+            text = rewrite_references(body.decode("utf-8"), manifest)
+            if name == "sw.js":
+                assets = json.dumps(sorted(manifest.values()))
+                text = SW_ASSETS_RE.sub(lambda _: f"const ASSETS = {assets};", text)
+            body = text.encode("utf-8")
+        _write(out_dir / name, body)
+
+    with open(out_dir / MANIFEST_FILE, "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    return manifest
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build content-hashed, precompressed static assets")
+    parser.add_argument("out_dir", nargs="?", default=str(BACKEND_DIR / "dist"),
+                        help="Output directory (default: backend/dist)")
+    args = parser.parse_args()
+
+    manifest = build_assets(Path(args.out_dir))
+    print(f"Built {len(manifest)} hashed assets in {args.out_dir}")
@@ -1,8 +1,308 @@
+import argparse
+import hashlib
 import json
 import re
-from typing import Dict, List, Any, Tuple
+from typing import Dict, List, Any, Iterator, Tuple
 from pathlib import Path
 
+# Bump when the conversion output changes so cached conversions are redone
+CONVERTER_VERSION = 2
+
+TOKEN_RE = re.compile(r'''
+    (?P<ws>\s+)
+  | (?P<comment>--\[(?P<level>=*)\[.*?\](?P=level)\]|--[^\n]*)
+  | (?P<string>"(?:[^"\\\n]|\\.)*"|'(?:[^'\\\n]|\\.)*')
+  | (?P<number>0[xX][0-9a-fA-F]+|\d+\.?\d*(?:[eE][+-]?\d+)?|\.\d+(?:[eE][+-]?\d+)?)
+  | (?P<name>[A-Za-z_][A-Za-z0-9_]*)
+  | (?P<op>\.\.\.|\.\.|==|~=|<=|>=|[{}\[\]().,:;=+\-*/%^#<>])
+''', re.VERBOSE | re.DOTALL)
+
+KEYWORDS = {"local", "for", "while", "if", "function", "do", "end", "return", "repeat", "until"}
+
+Token = Tuple[str, str]
+
+
+def tokenize(source: str) -> Iterator[Token]:
+    """Yield (kind, text) tokens for the Lua subset found in game dumps."""
+    pos = 0
+    length = len(source)
+    while pos < length:
+        match = TOKEN_RE.match(source, pos)
+        if not match:
+            raise SyntaxError(f"Unexpected character {source[pos]!r} at offset {pos}")
+        pos = match.end()
+        kind = match.lastgroup if match.lastgroup != "level" else "comment"
+        if kind in ("ws", "comment"):
+            continue
+        text = match.group(kind)
+        if kind == "name" and text in KEYWORDS:
+            kind = "keyword"
+        yield kind, text
+    yield "eof", ""
+
+
+class Opaque:
+    """A value the converter cannot evaluate (game services, required modules)."""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def __repr__(self) -> str:
+        return f"Opaque({self.path})"
+
+
+class LuaTableEvaluator:
+    """
+    Single-pass parser and evaluator for the table-building subset of Lua used by
+    FoodRecipeData dumps: locals, nested table constructors, property assignment,
+    ``<PlantTraitsData>.Traits.X`` lookups and the TableUtils ``MakeTable`` /
+    ``SetSubtract`` helpers. Every expression is evaluated exactly once when its
+    statement is reached and variables hold the resulting values, so later
+    references never re-resolve anything. Unsupported statements (loops,
+    functions) are skipped.
+    """
+
+    def __init__(self, items_by_trait: Dict[str, List[str]]):
+        self.items_by_trait = items_by_trait
+        self.vars: Dict[str, Any] = {}
+        self.returned: Any = None
+        self._tokens: List[Token] = []
+        self._pos = 0
+
+    # Token helpers
+
+    def _peek(self, offset: int = 0) -> Token:
+        return self._tokens[min(self._pos + offset, len(self._tokens) - 1)]
+
+    def _next(self) -> Token:
+        token = self._tokens[self._pos]
+        self._pos += 1
+        return token
+
+    def _accept(self, text: str) -> bool:
+        kind, value = self._peek()
+        if kind in ("op", "keyword") and value == text:
+            self._pos += 1
+            return True
+        return False
+
+    def _expect(self, text: str) -> None:
+        if not self._accept(text):
+            raise SyntaxError(f"Expected {text!r}, got {self._peek()[1]!r}")
+
+    # Statements
+
+    def run(self, source: str) -> Dict[str, Any]:
+        self._tokens = list(tokenize(source))
+        self._pos = 0
+        while self._peek()[0] != "eof":
+            self._statement()
+        return self.vars
+
+    def _statement(self) -> None:
+        kind, value = self._peek()
+        if kind == "op" and value == ";":
+            self._pos += 1
+        elif kind == "keyword" and value == "local":
+            self._pos += 1
+            if self._accept("function"):
+                self._skip_block(depth=1)
+                return
+            names = [self._next()[1]]
+            while self._accept(","):
+                names.append(self._next()[1])
+            values = self._expression_list() if self._accept("=") else []
+            for i, name in enumerate(names):
+                self.vars[name] = values[i] if i < len(values) else None
+        elif kind == "keyword" and value == "return":
+            self._pos += 1
+            if self._peek()[0] != "eof" and self._peek()[1] not in ("end", ";"):
+                self.returned = self._expression()
+        elif kind == "keyword" and value in ("for", "while", "if", "function", "do", "repeat"):
+            self._skip_block()
+        else:
+            self._assignment_or_call()
+
+    def _skip_block(self, depth: int = 0) -> None:
+        """Skip a compound statement up to its matching ``end`` (or ``until``)."""
+        while True:
+            kind, value = self._next()
+            if kind == "eof":
+                return
+            if kind != "keyword":
+                continue
+            # ``for``/``while`` bodies open with ``do``; ``if`` closes with one ``end``
+            if value in ("function", "do", "if", "repeat"):
+                depth += 1
+            elif value in ("end", "until"):
+                depth -= 1
+                if depth <= 0:
+                    if value == "until":
+                        self._expression()
+                    return
+
+    def _assignment_or_call(self) -> None:
+        _, container, key = self._suffixed_expression()
+        if self._accept("="):
+            value = self._expression()
+            if container is None:
+                self.vars[key] = value
+            elif isinstance(container, dict):
+                container[key] = value
+
+    # Expressions
+
+    def _expression_list(self) -> List[Any]:
+        values = [self._expression()]
+        while self._accept(","):
+            values.append(self._expression())
+        return values
+
+    def _expression(self) -> Any:
+        kind, value = self._peek()
+        if kind == "string":
+            self._pos += 1
+            return self._unquote(value)
+        if kind == "number":
+            self._pos += 1
+            if value.lower().startswith("0x"):
+                return int(value, 16)
+            return int(value) if value.isdigit() else float(value)
+        if kind == "name" and value in ("true", "false", "nil"):
+            self._pos += 1
+            return {"true": True, "false": False, "nil": None}[value]
+        if kind == "op" and value == "{":
+            return self._table()
+        if kind == "op" and value == "-":
+            self._pos += 1
+            operand = self._expression()
+            return -operand if isinstance(operand, (int, float)) else Opaque("-")
+        if kind == "keyword" and value == "function":
+            self._skip_block()
+            return Opaque("function")
+        return self._suffixed_expression()[0]
+
+    def _suffixed_expression(self) -> Tuple[Any, Any, Any]:
+        """
+        Parse ``name{.field | [expr] | :method(args) | (args)}``.
+
+        Returns (value, container, key) where container/key locate the last
+        field access so assignments can write through it.
+        """
+        kind, name = self._next()
+        if kind == "op" and name == "(":
+            value = self._expression()
+            self._expect(")")
+            container, key = None, None
+        elif kind == "name":
+            value = self.vars.get(name, Opaque(name))
+            container, key = None, name
+        else:
+            raise SyntaxError(f"Unexpected token {name!r}")
+
+        while True:
+            if self._accept("."):
+                field = self._next()[1]
+                container, key = value, field
+                value = self._index(value, field)
+            elif self._accept("["):
+                field = self._expression()
+                self._expect("]")
+                container, key = value, field
+                value = self._index(value, field)
+            elif self._accept(":"):
+                method = self._next()[1]
+                args = self._call_args()
+                value = self._call_method(value, method, args)
+                container, key = None, None
+            elif self._peek() == ("op", "(") or self._peek()[0] == "string":
+                args = self._call_args()
+                value = self._call(value, args)
+                container, key = None, None
+            else:
+                return value, container, key
+
+    def _call_args(self) -> List[Any]:
+        if self._peek()[0] == "string":
+            return [self._unquote(self._next()[1])]
+        self._expect("(")
+        if self._accept(")"):
+            return []
+        args = self._expression_list()
+        self._expect(")")
+        return args
+
+    def _table(self) -> Any:
+        self._expect("{")
+        entries: Dict[Any, Any] = {}
+        positional: List[Any] = []
+        while not self._accept("}"):
+            if self._accept("["):
+                key = self._expression()
+                self._expect("]")
+                self._expect("=")
+                entries[key] = self._expression()
+            elif self._peek()[0] == "name" and self._peek(1) == ("op", "="):
+                key = self._next()[1]
+                self._pos += 1
+                entries[key] = self._expression()
+            else:
+                positional.append(self._expression())
+            if not self._accept(","):
+                self._accept(";")
+        if not entries and positional:
+            return positional
+        for i, value in enumerate(positional, start=1):
+            entries[i] = value
+        return entries
+
+    @staticmethod
+    def _unquote(literal: str) -> str:
+        escapes = {"n": "\n", "t": "\t", "r": "\r", "\\": "\\", '"': '"', "'": "'"}
+        return re.sub(r"\\(.)", lambda m: escapes.get(m.group(1), m.group(1)), literal[1:-1])
+
+    # Evaluation of the game-specific helpers
+
+    def _index(self, value: Any, field: Any) -> Any:
+        if isinstance(value, dict):
+            return value.get(field)
+        if isinstance(value, list) and isinstance(field, int):
+            return value[field - 1] if 0 < field <= len(value) else None
+        if isinstance(value, Opaque):
+            if value.path.endswith("PlantTraitsData.Traits"):
+                return list(self.items_by_trait.get(field, []))
+            return Opaque(f"{value.path}.{field}")
+        return None
+
+    def _call(self, func: Any, args: List[Any]) -> Any:
+        if isinstance(func, Opaque) and func.path == "require" and args:
+            target = args[0]
+            return Opaque(target.path if isinstance(target, Opaque) else str(target))
+        return Opaque(f"{getattr(func, 'path', '?')}()")
+
+    def _call_method(self, receiver: Any, method: str, args: List[Any]) -> Any:
+        if method == "MakeTable":
+            # dict preserves first-seen order while deduplicating in O(n)
+            result: Dict[str, None] = {}
+            for arg in args:
+                result.update(dict.fromkeys(self._as_list(arg)))
+            return list(result)
+        if method == "SetSubtract" and len(args) >= 2:
+            remove = set(self._as_list(args[1]))
+            return [item for item in self._as_list(args[0]) if item not in remove]
+        return Opaque(f"{getattr(receiver, 'path', '?')}:{method}()")
+
+    @staticmethod
+    def _as_list(value: Any) -> List[Any]:
+        if isinstance(value, list):
+            return value
+        if isinstance(value, dict) and not value:
+            return []
+        if isinstance(value, str):
+            return [value]
+        return []
+
+
 class LuaConverter:
     def __init__(self, data_dir: str):
         self.data_dir = Path(data_dir)
@@ -10,14 +310,26 @@ class LuaConverter:
         self.lua_file = self.data_dir / "FoodRecipeData.lua"
         self.recipes_output = self.data_dir / "recipes.json"
         self.cooking_output = self.data_dir / "cooking.json"
-        
+        self.state_file = self.data_dir / ".convert_state.json"
+
         self.traits: Dict[str, List[str]] = {}
         self.items_by_trait: Dict[str, List[str]] = {}
         self.lua_vars: Dict[str, Any] = {}
         self.recipes: Dict[str, Any] = {}
         self.cooking_categories: Dict[str, List[str]] = {}
-        
-    def convert(self):
+
+    def convert(self, force: bool = False) -> bool:
+        """
+        Convert the Lua dump to recipes.json and cooking.json.
+
+        Skipped when the Lua file and plant_traits.json hash the same as at the
+        last conversion and the outputs are still present, unless ``force``.
+        Returns True if a conversion was performed.
+        """
+        source_hashes = self._source_hashes()
+        if not force and self._is_up_to_date(source_hashes):
+            print("Sources unchanged since last conversion, skipping.")
+            return False
         print("Loading traits...")
         self._load_traits()
         print("Parsing Lua...")
@@ -26,217 +338,125 @@ class LuaConverter:
         self._save_recipes()
         print(f"Saving {len(self.cooking_categories)} cooking categories to {self.cooking_output}...")
         self._save_cooking()
+        self._save_state(source_hashes)
         print("Done.")
+        return True
+
+    def write_snapshot(self) -> Path:
+        """Compile the converted JSON data into a binary snapshot for RecipeService."""
+        # Imported here so plain conversion works without the backend package on the path
+        from backend.services.recipe_service import RecipeService
+        service = RecipeService(str(self.data_dir), use_snapshot=False)
+        path = service.write_snapshot()
+        print(f"Saved snapshot {service.data_version[:12]} to {path}")
+        return path
+
+    def store_version(self) -> str:
+        """Add the converted data to the deduplicated version store in data/versions."""
+        from backend.services.recipe_service import RecipeService
+        from backend.services.version_store import VersionStore
+        service = RecipeService(str(self.data_dir), use_snapshot=False)
+        version_id = VersionStore(self.data_dir / "versions").add(service)
+        print(f"Stored dataset version {version_id}")
+        return version_id
+
+    def record_revision(self) -> int:
+        """Publish the converted data as the next revision in data/revisions.json (see /api/changes)."""
+        from backend.services.recipe_service import RecipeService
+        from backend.services.version_store import RevisionLog
+        service = RecipeService(str(self.data_dir), use_snapshot=False)
+        revision = RevisionLog(self.data_dir / "revisions.json").append(service.data_version)
+        print(f"Dataset {service.data_version[:12]} is revision {revision}")
+        return revision
+
+    def _source_hashes(self) -> Dict[str, Any]:
+        return {
+            "converter_version": CONVERTER_VERSION,
+            "lua_sha256": hashlib.sha256(self.lua_file.read_bytes()).hexdigest(),
+            "traits_sha256": hashlib.sha256(self.traits_file.read_bytes()).hexdigest(),
+        }
+
+    def _is_up_to_date(self, source_hashes: Dict[str, Any]) -> bool:
+        if not (self.state_file.exists() and self.recipes_output.exists() and self.cooking_output.exists()):
+            return False
+        try:
+            with open(self.state_file, 'r') as f:
+                return json.load(f) == source_hashes
+        except (OSError, ValueError):
+            return False
+
+    def _save_state(self, source_hashes: Dict[str, Any]) -> None:
+        with open(self.state_file, 'w') as f:
+            json.dump(source_hashes, f, indent=2)
 
     def _load_traits(self):
         with open(self.traits_file, 'r') as f:
             self.traits = json.load(f)
-            
+
         for item, trait_list in self.traits.items():
             for trait in trait_list:
                 if trait not in self.items_by_trait:
                     self.items_by_trait[trait] = []
                 self.items_by_trait[trait].append(item)
 
-    def _resolve_value(self, val_str: str) -> Any:
-        val_str = val_str.strip().rstrip(',')
-        
-        # Handle inline lists: { "A", "B" }
-        if val_str.startswith('{') and val_str.endswith('}'):
-            content = val_str[1:-1].strip()
-            if not content:
-                return []
-            return [x.strip().strip('"') for x in content.split(',')]
-
-        if val_str.startswith('"') and val_str.endswith('"'):
-            return val_str.strip('"')
-        if val_str.isdigit():
-            return int(val_str)
-        try:
-            return float(val_str)
-        except ValueError:
-            pass
-        
-        # Check if it's a variable reference
-        if val_str in self.lua_vars:
-            return self.lua_vars[val_str]
-        
-        if val_str.startswith('v2.Traits.'):
-            trait = val_str.split('.')[-1]
-            return self.items_by_trait.get(trait, [])
-        
-        if 'v3:MakeTable' in val_str:
-            return self._handle_function_call(val_str)
-            
-        if 'v3:SetSubtract' in val_str:
-            return self._handle_function_call(val_str)
-
-        return val_str
-
-    def _handle_function_call(self, line: str) -> List[str]:
-        if 'v3:MakeTable' in line:
-            args_match = re.search(r'v3:MakeTable\((.+)\)', line)
-            if args_match:
-                args = [x.strip() for x in args_match.group(1).split(',')]
-                result = []
-                for arg in args:
-                    resolved = self._resolve_value(arg)
-                    if isinstance(resolved, list):
-                        result.extend(resolved)
-                    elif isinstance(resolved, str):
-                        result.append(resolved)
-                return list(set(result))
-        
-        if 'v3:SetSubtract' in line:
-            content = line.split('v3:SetSubtract(')[1].split(')')[0]
-            parts = [p.strip() for p in content.split(',')]
-            if len(parts) >= 2:
-                set1 = set(self._resolve_value(parts[0]) if isinstance(self._resolve_value(parts[0]), list) else [])
-                set2 = set(self._resolve_value(parts[1]) if isinstance(self._resolve_value(parts[1]), list) else [])
-                return list(set1 - set2)
-        
-        return []
-
-    def _parse_table(self, lines: List[str], start_index: int) -> Tuple[Any, int]:
-        data_dict = {}
-        data_list = []
-        is_dict = False
-        
-        field_assign = re.compile(r'\["(.+?)"\] = (.+)')
-        
-        i = start_index
-        while i < len(lines):
-            line = lines[i].strip()
-            
-            if line.startswith('}') or line.startswith('},'):
-                return (data_dict if is_dict else data_list, i)
-            
-            # ["Key"] = Value
-            field_match = field_assign.search(line)
-            if field_match:
-                is_dict = True
-                key = field_match.group(1)
-                val_str = field_match.group(2).strip().rstrip(',')
-                
-                if val_str.startswith('{') and not val_str.endswith('}'):
-                    # Recurse
-                    val, i = self._parse_table(lines, i + 1)
-                    data_dict[key] = val
-                else:
-                    data_dict[key] = self._resolve_value(val_str)
-            
-            # "Value",
-            elif line.startswith('"'):
-                val = line.strip('", ')
-                data_list.append(val)
-
-            i += 1
-            
-        return (data_dict if is_dict else data_list, i)
-
     def _parse_lua_file(self):
-        with open(self.lua_file, 'r') as f:
-            lines = f.readlines()
+        with open(self.lua_file, 'r', encoding='utf-8') as f:
+            source = f.read()
+
+        evaluator = LuaTableEvaluator(self.items_by_trait)
+        self.lua_vars = evaluator.run(source)
 
-        local_list_start = re.compile(r'local (v\d+) = \{')
-        
         # Map variable names to cooking category names
         var_to_category = {
             'v5': 'Bread',
-            'v6': 'Meat', 
+            'v6': 'Meat',
             'v7': 'Leafy',
             'v8': 'Pastry',
             'v9': 'Tomato'
         }
-        
-        i = 0
-        while i < len(lines):
-            line = lines[i].strip()
-            
-            if line.startswith('--') or not line:
-                i += 1
+        for var_name, category_name in var_to_category.items():
+            val = self.lua_vars.get(var_name)
+            if isinstance(val, list):
+                self.cooking_categories[category_name] = val
+
+        # The module returns a table whose Recipes field holds every recipe
+        module = evaluator.returned
+        recipes = module.get('Recipes') if isinstance(module, dict) else None
+        if not isinstance(recipes, dict):
+            recipes = self.lua_vars.get('v10', {})
+
+        for recipe_name, recipe_data in recipes.items():
+            if not isinstance(recipe_data, dict):
                 continue
+            self.recipes[recipe_name] = self._build_recipe(recipe_data)
+
+    def _build_recipe(self, recipe_data: Dict[str, Any]) -> Dict[str, Any]:
+        # Extract ingredient requirements with counts
+        ingredients = {}
+        requires = recipe_data.get('Requires', {})
+        if not isinstance(requires, dict):
+            requires = {}
+        count = requires.get('Count', 0)
 
-            # local vX = { ... }
-            match = local_list_start.search(line)
-            if match:
-                var_name = match.group(1)
-                
-                # Check for single-line table definition
-                if line.strip().endswith('}'):
-                    val_part = line.split('=', 1)[1].strip()
-                    val = self._resolve_value(val_part)
-                    self.lua_vars[var_name] = val
-                    
-                    # If this is a cooking category variable, save it
-                    if var_name in var_to_category and isinstance(val, list):
-                        category_name = var_to_category[var_name]
-                        self.cooking_categories[category_name] = val
-                        
-                    i += 1
-                    continue
-                
-                # Parse table starting from next line
-                val, i = self._parse_table(lines, i + 1)
-                self.lua_vars[var_name] = val
-                
-                # If this is a cooking category variable, save it
-                if var_name in var_to_category and isinstance(val, list):
-                    category_name = var_to_category[var_name]
-                    self.cooking_categories[category_name] = val
-            
-            # vX.Prop = Val
-            prop_assign = re.match(r'(v\d+)\.(\w+) = (.+)', line)
-            if prop_assign:
-                target_var = prop_assign.group(1)
-                prop_name = prop_assign.group(2)
-                value_src = prop_assign.group(3)
-                
-                if target_var in self.lua_vars:
-                    val = self._resolve_value(value_src)
-                    if isinstance(self.lua_vars[target_var], list):
-                         if not self.lua_vars[target_var]:
-                             self.lua_vars[target_var] = {}
-                    
-                    if isinstance(self.lua_vars[target_var], dict):
-                        self.lua_vars[target_var][prop_name] = val
-
-            # v10.RecipeName = vX
-            recipe_match = re.match(r'v10\.(\w+) = (v\d+)', line)
-            if recipe_match:
-                recipe_name = recipe_match.group(1)
-                var_ref = recipe_match.group(2)
-                
-                if var_ref in self.lua_vars:
-                    recipe_data = self.lua_vars[var_ref]
-                    
-                    # Extract ingredient requirements with counts
-                    ingredients = {}
-                    if 'Requires' in recipe_data:
-                        requires = recipe_data['Requires']
-                        count = requires.get('Count', 0)
-                        
-                        if 'Ingredients' in requires:
-                            # Store just the category names, not the actual items
-                            # RecipeService will resolve these at runtime
-                            for category in requires['Ingredients'].keys():
-                                ingredients[category] = 1  # Each category needs 1 item
-                        elif count == 1:
-                            # Special case for Soup - accepts any single ingredient
-                            ingredients['Any'] = 1
-
-                    self.recipes[recipe_name] = {
-                        "id": recipe_data.get('Id', ''),
-                        "image_id": recipe_data.get('ImageId', ''),
-                        "ingredients": ingredients,
-                        "count": recipe_data.get('Requires', {}).get('Count', 0),
-                        "priority": recipe_data.get('Priority', 0),
-                        "base_time": recipe_data.get('BaseTime', 0),
-                        "base_weight": float(recipe_data.get('BaseWeight', 0)),
-                        "description": f"Requires {recipe_data.get('Requires', {}).get('Count', 0)} ingredients"
-                    }
-
-            i += 1
+        if 'Ingredients' in requires:
+            # Store just the category names, not the actual items
+            # RecipeService will resolve these at runtime
+            for category in requires['Ingredients'].keys():
+                ingredients[category] = 1  # Each category needs 1 item
+        elif count == 1:
+            # Special case for Soup - accepts any single ingredient
+            ingredients['Any'] = 1
+
+        return {
+            "id": recipe_data.get('Id', ''),
+            "image_id": recipe_data.get('ImageId', ''),
+            "ingredients": ingredients,
+            "count": count,
+            "priority": recipe_data.get('Priority', 0),
+            "base_time": recipe_data.get('BaseTime', 0),
+            "base_weight": float(recipe_data.get('BaseWeight', 0)),
+            "description": f"Requires {count} ingredients"
+        }
 
     def _save_recipes(self):
         with open(self.recipes_output, 'w') as f:
@@ -255,10 +475,24 @@ class LuaConverter:
             "Vegetables": [],  # Will be resolved from traits
             "Main": []  # Will be resolved from Meat + Vegetables
         }
-        
+
         with open(self.cooking_output, 'w') as f:
             json.dump(cooking_data, f, indent=2)
 
 if __name__ == "__main__":
-    converter = LuaConverter("e:/RecipeGenerator/data")
-    converter.convert()
+    parser = argparse.ArgumentParser(description="Convert FoodRecipeData.lua to recipes.json/cooking.json")
+    parser.add_argument("data_dir", nargs="?",
+                        default=str(Path(__file__).resolve().parent.parent / "data"))
+    parser.add_argument("--force", action="store_true", help="Convert even if sources are unchanged")
+    parser.add_argument("--snapshot", action="store_true",
+                        help="Also compile data/snapshot.bin for fast service start-up")
+    parser.add_argument("--no-store", action="store_true",
+                        help="Do not add the result to the data/versions history")
+    args = parser.parse_args()
+    converter = LuaConverter(args.data_dir)
+    converter.convert(force=args.force)
+    if not args.no_store:
+        converter.store_version()
+    converter.record_revision()
+    if args.snapshot:
+        converter.write_snapshot()
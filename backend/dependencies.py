@@ -1,16 +1,146 @@
+import asyncio
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Optional
+
+from fastapi import HTTPException
+
 from backend.services.recipe_service import RecipeService
+from backend.services.data_watcher import DataWatcher
+from backend.services.history import DatasetHistory
+from backend.services.version_store import RevisionLog, VersionStore
+from backend.services.shared_dataset import SharedDataset
+from backend.services.metrics import DATA_RELOADS, REGISTRY, Gauge
 
 from pathlib import Path
 
+logger = logging.getLogger(__name__)
+
 # Global instance
 BASE_DIR = Path(__file__).resolve().parent.parent
-_recipe_service = RecipeService(str(BASE_DIR / "data"))
+DATA_DIR = BASE_DIR / "data"
+_data_watcher: Optional[DataWatcher] = None
+
+# Seconds between data directory polls; 0 disables hot reload
+DATA_POLL_INTERVAL = float(os.environ.get("RECIPE_DATA_POLL_INTERVAL", "5"))
+
+# Snapshot path (e.g. /dev/shm/recipe-generator.snap) shared by all worker
+# processes; one of them loads and publishes the dataset, the rest attach
+SHARED_SNAPSHOT = os.environ.get("RECIPE_SHARED_SNAPSHOT")
+
+# Converted dataset versions (written by convert_lua_to_json.py); a few stay loaded
+RESIDENT_VERSIONS = int(os.environ.get("RECIPE_RESIDENT_VERSIONS", "4"))
+_version_store = VersionStore(DATA_DIR / "versions", RESIDENT_VERSIONS)
+
+# Number of recent dataset revisions kept in memory for /api/changes deltas;
+# older ones are rebuilt from the version store. Revisions come from the
+# converter's log; the server never writes it.
+HISTORY_SIZE = int(os.environ.get("RECIPE_HISTORY_SIZE", "16"))
+_history = DatasetHistory(HISTORY_SIZE, _version_store, RevisionLog(DATA_DIR / "revisions.json"))
+
+def _swap_service(service: RecipeService) -> bool:
+    """Swap in a freshly built service; False (keeping the old one) if it failed to load."""
+    global _recipe_service
+    if service.load_error:
+        DATA_RELOADS.inc(1, "failed")
+        logger.warning(f"Keeping data version {_recipe_service.data_version[:12]}: {service.load_error}")
+        return False
+    if service.data_version != _recipe_service.data_version:
+        DATA_RELOADS.inc(1, "swapped")
+        _history.record(service)
+        _recipe_service = service
+        logger.info(f"Reloaded data version {service.data_version[:12]}")
+    else:
+        DATA_RELOADS.inc(1, "unchanged")
+    return True
+
+_shared_dataset = (SharedDataset(str(DATA_DIR), SHARED_SNAPSHOT, _swap_service, DATA_POLL_INTERVAL or 5.0)
+                   if SHARED_SNAPSHOT else None)
+_recipe_service = _shared_dataset.load() if _shared_dataset else RecipeService(str(DATA_DIR))
+_history.record(_recipe_service)
+
+def _dataset_size():
+    service = _recipe_service
+    return {
+        ("items",): len(service.item_names),
+        ("recipes",): len(service.recipes_data),
+        ("traits",): len(service.trait_masks),
+        ("categories",): len(service.category_masks),
+        ("shop_seeds",): len(service.shop_seeds),
+        ("cached_responses",): len(service.response_cache),
+        ("cached_detail_responses",): len(service.detail_cache),
+    }
+
+REGISTRY.register(Gauge("recipe_dataset_size", "Size of the currently loaded dataset",
+                        ("kind",), callback=_dataset_size))
+
+# Bounded pool for CPU-heavy request work so it never runs on the event loop
+COMPUTE_WORKERS = int(os.environ.get("RECIPE_COMPUTE_WORKERS", str(min(4, os.cpu_count() or 1))))
+COMPUTE_MAX_PENDING = int(os.environ.get("RECIPE_COMPUTE_MAX_PENDING", "64"))
+_compute_executor = ThreadPoolExecutor(max_workers=COMPUTE_WORKERS, thread_name_prefix="recipe-compute")
+_compute_pending = 0
+
+async def run_compute(func: Callable[..., Any], *args: Any) -> Any:
+    """
+    Run a blocking computation on the bounded compute pool.
+
+    Requests beyond COMPUTE_MAX_PENDING queued jobs are rejected with 503 rather
+    than queueing unboundedly behind slow work.
+    """
+    global _compute_pending
+    if _compute_pending >= COMPUTE_MAX_PENDING:
+        raise HTTPException(status_code=503, detail="Server busy, retry shortly",
+                            headers={"Retry-After": "1"})
+    _compute_pending += 1
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_compute_executor, partial(func, *args))
+    finally:
+        _compute_pending -= 1
 
 def load_global_data():
     """Load data on startup."""
     # RecipeService loads data in __init__, so this is just for compatibility
     print(f"RecipeService loaded {len(_recipe_service.recipes_data)} recipes")
 
+def reload_recipe_service() -> bool:
+    """
+    Build a fresh RecipeService from disk and swap it in.
+
+    The new service is fully built before the global reference is rebound, so
+    requests that already hold the old instance keep a consistent view.
+    """
+    return _swap_service(RecipeService(str(DATA_DIR)))
+
+def start_data_watcher() -> None:
+    """Start polling the data directory for changes (no-op if disabled)."""
+    global _data_watcher
+    if DATA_POLL_INTERVAL <= 0 or _data_watcher is not None:
+        return
+    if _shared_dataset is not None:
+        _shared_dataset.start()
+        return
+    _data_watcher = DataWatcher(str(DATA_DIR), reload_recipe_service, DATA_POLL_INTERVAL)
+    _data_watcher.start()
+
+def stop_data_watcher() -> None:
+    global _data_watcher
+    if _shared_dataset is not None:
+        _shared_dataset.stop()
+    if _data_watcher is not None:
+        _data_watcher.stop()
+        _data_watcher = None
+
+def get_history() -> DatasetHistory:
+    """Get the history of recently served dataset revisions."""
+    return _history
+
+def get_version_store() -> VersionStore:
+    """Get the store of historical dataset versions."""
+    return _version_store
+
 def get_recipe_service() -> RecipeService:
-    """Get the global RecipeService instance."""
+    """Get the current RecipeService instance."""
     return _recipe_service
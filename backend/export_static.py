@@ -0,0 +1,81 @@
+"""
+Export the site as a static bundle that any CDN or static file server can host.
+
+    python -m backend.export_static dist/
+
+Writes index.html, the /static assets, sitemap.xml, robots.txt, favicon.ico, sw.js and the
+pre-rendered JSON API responses (with .gz and, if brotli is installed, .br
+copies) using the same bytes and ETags the live API serves:
+
+    api/recipes.json            GET /api/recipes
+    api/recipes.shop_only.json  GET /api/recipes?shop_only=true
+    api/stats.json              GET /api/stats
+    api/items.json              GET /api/items
+
+Static hosts ignore query strings, so the exported index.html sets
+``window.STATIC_API`` and app.js then requests the file names above. Dynamic
+endpoints (combinations, cook simulator, ...) still need the Python app.
+"""
+import argparse
+import json
+import shutil
+from pathlib import Path
+from typing import Dict
+
+from backend.services.recipe_service import RecipeService
+from backend.services.response_cache import EncodedResponse, encode_json
+
+BACKEND_DIR = Path(__file__).resolve().parent
+STATIC_API_SCRIPT = '<script>window.STATIC_API = true;</script>\n    <script src="/static/js/app.js"></script>'
+
+
+def api_payloads(service: RecipeService) -> Dict[str, EncodedResponse]:
+    """Encode every cacheable API response, keyed by its file path in the bundle."""
+    return {
+        "api/recipes.json": encode_json(list(service.get_all_recipes().values())),
+        "api/recipes.shop_only.json": encode_json(list(service.get_shop_only_recipes().values())),
+        "api/stats.json": encode_json(service.get_stats()),
+        "api/items.json": encode_json(service.get_items()),
+    }
+
+
+def _write_encoded(path: Path, encoded: EncodedResponse) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(encoded.body)
+    path.with_name(path.name + ".gz").write_bytes(encoded.gzip)
+    if encoded.br is not None:
+        path.with_name(path.name + ".br").write_bytes(encoded.br)
+
+
+def export_static(out_dir: Path, service: RecipeService) -> Dict[str, str]:
+    """Write the static bundle to ``out_dir`` and return a path -> ETag manifest."""
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    # Page and crawler files
+    html = (BACKEND_DIR / "templates" / "index.html").read_text(encoding="utf-8")
+    html = html.replace('<script src="/static/js/app.js"></script>', STATIC_API_SCRIPT)
+    (out_dir / "index.html").write_text(html, encoding="utf-8")
+    for name in ("sitemap.xml", "robots.txt", "favicon.ico", "sw.js"):
+        shutil.copyfile(BACKEND_DIR / "static" / name, out_dir / name)
+
+    # Static assets
+    shutil.copytree(BACKEND_DIR / "static", out_dir / "static", dirs_exist_ok=True)
+
+    # Pre-rendered API responses
+    manifest = {}
+    for rel_path, encoded in api_payloads(service).items():
+        _write_encoded(out_dir / rel_path, encoded)
+        manifest[rel_path] = encoded.etag
+
+    with open(out_dir / "manifest.json", "w") as f:
+        json.dump({"data_version": service.data_version, "files": manifest}, f, indent=2)
+    return manifest
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export a static, CDN-ready bundle of the site")
+    parser.add_argument("out_dir", help="Directory to write the bundle to")
+    parser.add_argument("--data-dir", default=str(BACKEND_DIR.parent / "data"))
+    args = parser.parse_args()
+    manifest = export_static(Path(args.out_dir), RecipeService(args.data_dir))
+    print(f"Exported {len(manifest)} API responses to {args.out_dir}")
@@ -1,8 +1,8 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
-from backend.dependencies import load_global_data
-from backend.routers import recipes, stats, items, views
+from backend.middleware import MetricsMiddleware
+from backend.dependencies import load_global_data, start_data_watcher, stop_data_watcher
+from backend.routers import recipes, stats, items, views, cook, metrics, changes, versions
 
 app = FastAPI(title="Recipe Generator API")
 
@@ -15,19 +15,23 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+app.add_middleware(MetricsMiddleware)
+
 # Include Routers
 app.include_router(recipes.router)
 app.include_router(stats.router)
 app.include_router(items.router)
+app.include_router(changes.router)
+app.include_router(versions.router)
+app.include_router(cook.router)
+app.include_router(metrics.router)
 app.include_router(views.router)
 
-from pathlib import Path
-
-BASE_DIR = Path(__file__).resolve().parent
-
-# Serve Static Files
-app.mount("/static", StaticFiles(directory=str(BASE_DIR / "static")), name="static")
-
 @app.on_event("startup")
 async def startup_event():
     load_global_data()
+    start_data_watcher()
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    stop_data_watcher()
@@ -0,0 +1,53 @@
+"""
+ASGI middleware recording request metrics.
+"""
+import time
+
+from backend.services.metrics import HTTP_REQUEST_BYTES, HTTP_REQUEST_SECONDS, HTTP_RESPONSE_BYTES
+
+
+class MetricsMiddleware:
+    """
+    Record latency and body sizes per route template (not raw path, to bound cardinality).
+
+    A plain ASGI wrapper rather than BaseHTTPMiddleware: it adds no extra
+    task or response copy per request, and it counts the body chunks actually
+    received and sent, so streamed responses (NDJSON) are measured too.
+    Latency runs until the last body chunk has been sent.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        received = 0
+        sent = 0
+        status = 500
+
+        async def counting_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+            return message
+
+        async def counting_send(message):
+            nonlocal sent, status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                sent += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, counting_receive, counting_send)
+        finally:
+            route = getattr(scope.get("route"), "path", "unmatched")
+            HTTP_REQUEST_SECONDS.observe(time.perf_counter() - start, scope["method"], route, str(status))
+            HTTP_REQUEST_BYTES.inc(received, route)
+            HTTP_RESPONSE_BYTES.inc(sent, route)
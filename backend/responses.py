@@ -0,0 +1,136 @@
+from typing import Any, Callable, Hashable, Optional, Tuple
+
+from fastapi import Request, Response
+
+from backend.dependencies import run_compute
+from backend.services.recipe_service import RecipeService
+from backend.services.response_cache import EncodedResponse
+
+CACHE_CONTROL = "public, no-cache"
+
+
+def _accepted_codings(header: str) -> set:
+    """Parse an Accept-Encoding header into the set of codings with q > 0."""
+    codings = set()
+    for part in header.split(","):
+        coding, _, params = part.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        if coding and q > 0:
+            codings.add(coding.strip().lower())
+    return codings
+
+
+def _etag_matches(header: Optional[str], etag: str) -> bool:
+    """Check an If-None-Match header against a strong ETag."""
+    if not header:
+        return False
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+def _byte_range(header: Optional[str], length: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a single-range ``Range: bytes=...`` header into inclusive (start, end).
+
+    Returns None to send the whole body (no header, another unit, several
+    ranges or an invalid range-spec such as ``5-3``) and (length, length) when
+    the range cannot be satisfied.
+    """
+    if not header:
+        return None
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+    first, dash, last = spec.strip().partition("-")
+    try:
+        if not dash:
+            return None
+        if not first:
+            suffix = int(last)
+            if suffix <= 0:
+                return (length, length)
+            return (max(0, length - suffix), length - 1)
+        start = int(first)
+        end = int(last) if last else length - 1
+    except ValueError:
+        return None
+    if last and end < start:
+        # Invalid, not unsatisfiable: the header is ignored (RFC 9110 14.1.1)
+        return None
+    if start >= length:
+        return (length, length)
+    end = min(end, length - 1)
+    return (start, end)
+
+
+def encoded_response(request: Request, encoded: EncodedResponse,
+                     cache_control: str = CACHE_CONTROL, ranges: bool = False) -> Response:
+    """
+    Build a response for a pre-encoded payload, honoring If-None-Match and Accept-Encoding.
+
+    HEAD gets the headers of the GET response and no body. With ``ranges``,
+    single byte ranges of the selected representation are served as 206
+    (guarded by If-Range).
+    """
+    accepted = _accepted_codings(request.headers.get("accept-encoding", ""))
+    encoding = None
+    if "br" in accepted and encoded.br is not None:
+        encoding = "br"
+    elif "gzip" in accepted and encoded.gzip is not None:
+        encoding = "gzip"
+    headers = {
+        "ETag": encoded.variant_etag(encoding),
+        "Cache-Control": cache_control,
+        "Vary": "Accept-Encoding",
+    }
+    if ranges:
+        headers["Accept-Ranges"] = "bytes"
+    if _etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    body = encoded.variant(encoding)
+    status_code = 200
+
+    if_range = request.headers.get("if-range")
+    byte_range = (_byte_range(request.headers.get("range"), len(body))
+                  if ranges and (if_range is None or if_range == headers["ETag"]) else None)
+    if byte_range is not None:
+        start, end = byte_range
+        if start >= len(body):
+            headers["Content-Range"] = f"bytes */{len(body)}"
+            return Response(status_code=416, headers=headers)
+        headers["Content-Range"] = f"bytes {start}-{end}/{len(body)}"
+        body, status_code = body[start:end + 1], 206
+
+    if request.method == "HEAD":
+        headers["Content-Length"] = str(len(body))
+        body = b""
+    return Response(content=body, status_code=status_code, media_type=encoded.media_type,
+                    headers=headers)
+
+
+async def cached_json_response(request: Request, service: RecipeService, key: Hashable,
+                               build: Callable[[], Any], detail: bool = False) -> Response:
+    """
+    Serve ``build()`` from the service's response cache, encoding it on first use.
+
+    Hits return without blocking; misses build and compress on the compute pool.
+    ``detail`` marks keys with an open-ended part (an item, a recipe, a filter
+    list), which go to the separate ``detail_cache``.
+    """
+    cache = service.detail_cache if detail else service.response_cache
+    cache_key = (service.data_version, key)
+    encoded = cache.get(cache_key)
+    if encoded is None:
+        encoded = await run_compute(cache.get_or_build, cache_key, build)
+    return encoded_response(request, encoded)
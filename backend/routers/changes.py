@@ -0,0 +1,28 @@
+from fastapi import APIRouter, Depends, Query, Request
+from typing import Dict
+from backend.services.history import DatasetHistory
+from backend.services.recipe_service import RecipeService
+from backend.dependencies import get_history, get_recipe_service
+from backend.responses import cached_json_response
+
+router = APIRouter(prefix="/api/changes", tags=["changes"])
+
+@router.get("", response_model=Dict)
+async def get_changes(
+    request: Request,
+    since: int = Query(0, ge=0, description="Revision the client already has (0 for everything)"),
+    service: RecipeService = Depends(get_recipe_service),
+    history: DatasetHistory = Depends(get_history)
+):
+    """
+    Recipes, category members, traits and shop seeds added, removed or changed since a revision.
+
+    ``reset`` is true when ``since`` is unknown or too old to diff against; the
+    response then holds the full dataset as additions. Revisions persist across
+    restarts and are the same on every worker.
+    """
+    # Every unusable ``since`` gets the same full reset, so it shares one cache entry
+    key = since if history.known(since, service) else "reset"
+    return await cached_json_response(request, service, ("changes", key),
+                                      lambda: history.changes(since if key != "reset" else None, service),
+                                      detail=True)
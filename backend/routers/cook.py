@@ -0,0 +1,49 @@
+from fastapi import APIRouter, Depends
+from pydantic import BaseModel, Field
+from typing import Annotated, Dict, List
+from backend.services.recipe_service import RecipeService
+from backend.dependencies import get_recipe_service, run_compute
+
+router = APIRouter(prefix="/api/cook", tags=["cook"])
+
+# Upper bound for a single item count; far above any real inventory
+MAX_ITEM_COUNT = 1_000_000
+
+class InventoryRequest(BaseModel):
+    items: Dict[str, Annotated[int, Field(ge=0, le=MAX_ITEM_COUNT)]] = Field(
+        ..., description="Plant name -> number of that item held"
+    )
+
+@router.post("/match", response_model=Dict)
+async def match_inventory(
+    inventory: InventoryRequest,
+    service: RecipeService = Depends(get_recipe_service)
+):
+    """List every recipe the inventory can make, with one item assigned per category."""
+    return service.match_inventory(inventory.items)
+
+class BatchRequest(BaseModel):
+    inventories: List[Dict[str, Annotated[int, Field(ge=0, le=MAX_ITEM_COUNT)]]] = Field(
+        ..., max_length=50_000, description="Inventories to evaluate, each plant name -> count"
+    )
+
+@router.post("/batch", response_model=Dict)
+async def evaluate_inventories(
+    batch: BatchRequest,
+    service: RecipeService = Depends(get_recipe_service)
+):
+    """Evaluate many inventories against every recipe in vectorized passes."""
+    # In-process: a pool per request (forked from a threaded server) costs more than it saves
+    return await run_compute(service.evaluate_inventories, batch.inventories, 1)
+
+class PotRequest(BaseModel):
+    ingredients: List[str] = Field(..., description="Exact items in the pot, repeated per unit")
+    runners_up: int = Field(3, ge=0, le=50)
+
+@router.post("/simulate", response_model=Dict)
+async def simulate_cook(
+    pot: PotRequest,
+    service: RecipeService = Depends(get_recipe_service)
+):
+    """Return the recipe a pot produces (highest priority match) and the runner-up candidates."""
+    return service.simulate_cook(pot.ingredients, pot.runners_up)
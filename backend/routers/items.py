@@ -1,11 +1,34 @@
-from fastapi import APIRouter, Depends
-from typing import Dict
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from typing import Dict, List
 from backend.services.recipe_service import RecipeService
 from backend.dependencies import get_recipe_service
+from backend.responses import cached_json_response
 
 router = APIRouter(prefix="/api/items", tags=["items"])
 
 @router.get("", response_model=Dict)
-async def get_items(service: RecipeService = Depends(get_recipe_service)):
+async def get_items(request: Request, service: RecipeService = Depends(get_recipe_service)):
     """Get all items data (shop seeds and traits)."""
-    return service.get_items()
+    return await cached_json_response(request, service, "items", service.get_items)
+
+@router.get("/search", response_model=List[Dict])
+async def search_items(
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(10, ge=1, le=50),
+    service: RecipeService = Depends(get_recipe_service)
+):
+    """Prefix and typo-tolerant search over plant and recipe names, with traits and categories."""
+    return service.search(q, limit)
+
+@router.get("/{name}/uses", response_model=Dict)
+async def get_item_uses(
+    request: Request,
+    name: str,
+    service: RecipeService = Depends(get_recipe_service)
+):
+    """Categories an item satisfies and the recipes it can contribute to."""
+    item = service.find_item(name)
+    if item is None:
+        raise HTTPException(status_code=404, detail=f"Item '{name}' not found")
+    return await cached_json_response(request, service, ("uses", item), lambda: service.item_uses(item),
+                                      detail=True)
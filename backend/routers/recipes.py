@@ -1,20 +1,129 @@
-from fastapi import APIRouter, Depends
-from typing import List, Dict
+import json
+from itertools import islice
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from typing import List, Dict, Optional, Union
 from backend.services.recipe_service import RecipeService
-from backend.dependencies import get_recipe_service
+from backend.dependencies import get_recipe_service, run_compute
+from backend.responses import cached_json_response
 
 router = APIRouter(prefix="/api/recipes", tags=["recipes"])
 
-@router.get("", response_model=List[Dict])
+STREAM_CHUNK_LINES = 500
+
+def _split(value: Optional[str]) -> Optional[List[str]]:
+    """Parse a comma-separated query parameter into a sorted, de-duplicated list."""
+    if value is None:
+        return None
+    return sorted({part.strip() for part in value.split(",") if part.strip()})
+
+@router.get("", response_model=Union[List[Dict], Dict])
 async def get_recipes(
+    request: Request,
+    shop_only: bool = False,
+    format: str = Query("full", pattern="^(full|compact)$",
+                        description="'compact' returns a shared item table and member bitsets"),
+    fields: Optional[str] = Query(None, description="Comma-separated recipe fields to include"),
+    names: Optional[str] = Query(None, description="Comma-separated recipe names to include"),
+    seeds: Optional[str] = Query(None, description="Comma-separated seeds available (e.g. today's shop stock)"),
+    service: RecipeService = Depends(get_recipe_service)
+):
+    """Get all recipes, optionally filtered to shop seeds only or to an arbitrary seed set."""
+    field_list = _split(fields)
+    name_list = _split(names)
+    seed_list = _split(seeds)
+    if field_list == []:
+        raise HTTPException(status_code=400, detail="fields must name at least one field")
+    if field_list is not None:
+        unknown = set(field_list) - set(RecipeService.RECIPE_FIELDS)
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(sorted(unknown))}")
+    if seed_list is not None:
+        unknown = [seed for seed in seed_list if seed not in service.item_ids]
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown seeds: {', '.join(unknown)}")
+
+    def build():
+        return service.get_recipes_view(shop_only, format == "compact", field_list, name_list, seed_list)
+
+    # Seed lists are sorted and de-duplicated, so each seed set has one cache entry
+    key = RecipeService.recipes_cache_key(shop_only, format, field_list, name_list, seed_list)
+    filtered = any(value is not None for value in (field_list, name_list, seed_list))
+    return await cached_json_response(request, service, key, build, detail=filtered)
+
+@router.get("/{name}", response_model=Dict)
+async def get_recipe(
+    request: Request,
+    name: str,
+    shop_only: bool = False,
+    service: RecipeService = Depends(get_recipe_service)
+):
+    """Get a single recipe by name (key or display name)."""
+    recipe = service.get_recipe(name, shop_only)
+    if recipe is None:
+        raise HTTPException(status_code=404, detail=f"Recipe '{name}' not found")
+    return await cached_json_response(request, service, ("recipe", service.find_recipe(name), shop_only),
+                                      lambda: recipe, detail=True)
+
+@router.get("/{name}/count", response_model=Dict)
+async def get_recipe_count(
+    name: str,
+    shop_only: bool = False,
+    exclude: List[str] = Query([], description="Items that must not be used"),
+    service: RecipeService = Depends(get_recipe_service)
+):
+    """Exact combination counts for a recipe, accounting for items shared between categories."""
+    try:
+        return await run_compute(service.count_recipe, name, shop_only, exclude)
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Recipe '{name}' not found")
+
+@router.get("/{name}/combinations")
+async def get_recipe_combinations(
+    name: str,
+    cursor: int = Query(0, ge=0, description="Mixed-radix index to resume from"),
+    limit: int = Query(1000, ge=1, le=100_000),
     shop_only: bool = False,
+    exclude: List[str] = Query([], description="Items that must not be used"),
     service: RecipeService = Depends(get_recipe_service)
 ):
-    """Get all recipes, optionally filtered to shop seeds only."""
-    if shop_only:
-        recipes = service.get_shop_only_recipes()
-    else:
-        recipes = service.get_all_recipes()
-    
-    # Convert dict to list for API response
-    return list(recipes.values())
+    """
+    Stream concrete ingredient combinations for a recipe as NDJSON.
+
+    Each line is ``{"index": ..., "ingredients": {...}}``, always with distinct
+    items. The last line carries ``next_cursor`` (null when exhausted),
+    ``total`` (the size of the index space, the product of the category sizes),
+    ``distinct_total`` (the combinations actually streamed) and the data version.
+    """
+    try:
+        counts = await run_compute(service.count_recipe, name, shop_only, exclude)
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Recipe '{name}' not found")
+
+    def generate():
+        combos = service.iter_combinations(name, cursor, shop_only, exclude)
+        last = None
+        sent = 0
+        lines = []
+        for index, ingredients in islice(combos, limit):
+            last = index
+            sent += 1
+            lines.append(json.dumps({"index": index, "ingredients": ingredients}) + "\n")
+            # Each yield is a thread-pool hop, so send lines in chunks
+            if len(lines) >= STREAM_CHUNK_LINES:
+                yield "".join(lines)
+                lines = []
+        if lines:
+            yield "".join(lines)
+        total = counts["product"]
+        # A short page means the rest of the index space held no distinct combination
+        next_cursor = last + 1 if sent == limit and last + 1 < total else None
+        yield json.dumps({
+            "next_cursor": next_cursor,
+            "total": total,
+            "distinct_total": counts["assignments"],
+            "data_version": service.data_version,
+        }) + "\n"
+
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
@@ -1,11 +1,12 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
 from typing import Dict
 from backend.services.recipe_service import RecipeService
 from backend.dependencies import get_recipe_service
+from backend.responses import cached_json_response
 
 router = APIRouter(prefix="/api/stats", tags=["stats"])
 
 @router.get("", response_model=Dict)
-async def get_stats(service: RecipeService = Depends(get_recipe_service)):
+async def get_stats(request: Request, service: RecipeService = Depends(get_recipe_service)):
     """Get recipe statistics."""
-    return service.get_stats()
+    return await cached_json_response(request, service, "stats", service.get_stats)
@@ -0,0 +1,58 @@
+from fastapi import APIRouter, Depends, HTTPException, Request
+from typing import Dict, List
+from backend.services.recipe_service import RecipeService
+from backend.services.version_store import VersionStore
+from backend.dependencies import get_recipe_service, get_version_store, run_compute
+from backend.responses import cached_json_response
+
+router = APIRouter(prefix="/api/versions", tags=["versions"])
+
+async def _version_service(version_id: str, current: RecipeService,
+                           store: VersionStore) -> RecipeService:
+    """Service for a stored version; the live dataset is used when the ID is current."""
+    if current.data_version.startswith(version_id):
+        return current
+    # Loading a version not yet resident reads its records from disk
+    service = await run_compute(store.service, version_id)
+    if service is None:
+        raise HTTPException(status_code=404, detail=f"Version '{version_id}' not found")
+    return service
+
+@router.get("", response_model=List[Dict])
+async def list_versions(
+    current: RecipeService = Depends(get_recipe_service),
+    store: VersionStore = Depends(get_version_store)
+):
+    """List stored dataset versions, oldest first, marking the one currently served."""
+    return [{**version, "current": version["data_version"] == current.data_version}
+            for version in store.versions()]
+
+@router.get("/{version_id}/recipes")
+async def get_version_recipes(
+    request: Request,
+    version_id: str,
+    shop_only: bool = False,
+    current: RecipeService = Depends(get_recipe_service),
+    store: VersionStore = Depends(get_version_store)
+):
+    """Get all recipes as they were in a stored version (ID or unique prefix)."""
+    service = await _version_service(version_id, current, store)
+    return await cached_json_response(request, service, RecipeService.recipes_cache_key(shop_only),
+                                      lambda: service.get_recipes_view(shop_only))
+
+@router.get("/{version_id}/recipes/{name}", response_model=Dict)
+async def get_version_recipe(
+    request: Request,
+    version_id: str,
+    name: str,
+    shop_only: bool = False,
+    current: RecipeService = Depends(get_recipe_service),
+    store: VersionStore = Depends(get_version_store)
+):
+    """Get a single recipe as it was in a stored version."""
+    service = await _version_service(version_id, current, store)
+    recipe = service.get_recipe(name, shop_only)
+    if recipe is None:
+        raise HTTPException(status_code=404, detail=f"Recipe '{name}' not found in version '{version_id}'")
+    return await cached_json_response(request, service, ("recipe", service.find_recipe(name), shop_only),
+                                      lambda: recipe, detail=True)
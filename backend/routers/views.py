@@ -1,21 +1,38 @@
-from fastapi import APIRouter
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, HTTPException, Request
 
 from pathlib import Path
 
+from backend.responses import CACHE_CONTROL, encoded_response
+from backend.services.assets import AssetStore
+
 router = APIRouter(tags=["views"])
 
-@router.get("/")
-async def read_root():
-    BASE_DIR = Path(__file__).resolve().parent.parent
-    return FileResponse(BASE_DIR / "templates/index.html")
+BASE_DIR = Path(__file__).resolve().parent.parent
+# Pages and static files are read once at startup; see backend/build_assets.py
+ASSETS = AssetStore.load(BASE_DIR, BASE_DIR / "dist")
+IMMUTABLE = "public, max-age=31536000, immutable"
+
+@router.api_route("/", methods=["GET", "HEAD"])
+async def read_root(request: Request):
+    return encoded_response(request, ASSETS.pages["index.html"])
+
+@router.api_route("/sitemap.xml", methods=["GET", "HEAD"])
+async def get_sitemap(request: Request):
+    return encoded_response(request, ASSETS.pages["sitemap.xml"])
+
+@router.api_route("/robots.txt", methods=["GET", "HEAD"])
+async def get_robots(request: Request):
+    return encoded_response(request, ASSETS.pages["robots.txt"])
 
-@router.get("/sitemap.xml")
-async def get_sitemap():
-    BASE_DIR = Path(__file__).resolve().parent.parent
-    return FileResponse(BASE_DIR / "static/sitemap.xml", media_type="application/xml")
+@router.api_route("/sw.js", methods=["GET", "HEAD"])
+async def get_service_worker(request: Request):
+    # Served from the root so it controls the whole site; browsers revalidate it on every load
+    return encoded_response(request, ASSETS.pages["sw.js"])
 
-@router.get("/robots.txt")
-async def get_robots():
-    BASE_DIR = Path(__file__).resolve().parent.parent
-    return FileResponse(BASE_DIR / "static/robots.txt", media_type="text/plain")
+@router.api_route("/static/{path:path}", methods=["GET", "HEAD"])
+async def get_static(request: Request, path: str):
+    encoded = ASSETS.static.get(path)
+    if encoded is None:
+        raise HTTPException(status_code=404, detail="Not Found")
+    cache_control = IMMUTABLE if path in ASSETS.immutable else CACHE_CONTROL
+    return encoded_response(request, encoded, cache_control, ranges=True)
@@ -0,0 +1,98 @@
+"""
+In-memory store of the site's static files, ready to serve.
+
+Loads the hashed build from backend/build_assets.py when present, otherwise the
+unhashed sources. Either way every file is held as an EncodedResponse (body,
+gzip/brotli copies, ETag), so requests never touch the filesystem.
+"""
+import json
+import logging
+import mimetypes
+from pathlib import Path
+from typing import Dict, Optional
+
+from backend.services.response_cache import EncodedResponse, encode_bytes
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILE = "manifest.json"
+# Served from fixed root URLs, so never hashed
+ROOT_FILES = ("robots.txt", "sitemap.xml", "sw.js")
+COMPRESSIBLE = {".css", ".html", ".ico", ".js", ".json", ".svg", ".txt", ".xml"}
+
+mimetypes.add_type("image/webp", ".webp")
+mimetypes.add_type("text/javascript", ".js")
+
+
+def _media_type(path: Path) -> str:
+    media_type = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+    if media_type.startswith("text/") or media_type == "application/xml":
+        media_type += "; charset=utf-8"
+    return media_type
+
+
+def _load_file(path: Path) -> EncodedResponse:
+    """Load a file and its prebuilt .gz/.br copies, compressing text files that lack them."""
+    body = path.read_bytes()
+    if path.suffix not in COMPRESSIBLE:
+        # Images are already compressed; send them as-is for every coding
+        return encode_bytes(body, _media_type(path), compress=False)
+    gz, br = path.with_name(path.name + ".gz"), path.with_name(path.name + ".br")
+    # Use the copies from the asset build if there are any, else compress now
+    encoded = encode_bytes(body, _media_type(path), compress=not gz.exists())
+    if not gz.exists():
+        return encoded
+    return EncodedResponse(
+        body=body,
+        gzip=gz.read_bytes(),
+        br=br.read_bytes() if br.exists() else None,
+        etag=encoded.etag,
+        media_type=encoded.media_type,
+    )
+
+
+class AssetStore:
+    """
+    Pages (index.html, robots.txt, ...) and /static files, preloaded.
+
+    ``immutable`` holds the /static paths that carry a content hash and can be
+    cached forever.
+    """
+
+    def __init__(self, pages: Dict[str, EncodedResponse], static: Dict[str, EncodedResponse],
+                 immutable: set):
+        self.pages = pages
+        self.static = static
+        self.immutable = immutable
+
+    @classmethod
+    def load(cls, backend_dir: Path, dist_dir: Optional[Path] = None) -> "AssetStore":
+        """
+        Load the build in ``dist_dir`` if there is one, else the sources under ``backend_dir``.
+
+        Unhashed source files stay available either way, for pages cached
+        before a deploy.
+        """
+        static = cls._load_tree(backend_dir / "static")
+        immutable = set()
+        if dist_dir is not None and (dist_dir / MANIFEST_FILE).exists():
+            manifest = json.loads((dist_dir / MANIFEST_FILE).read_text())
+            root, template = dist_dir, dist_dir / "index.html"
+            static.update(cls._load_tree(dist_dir / "static"))
+            immutable = {hashed[len("/static/"):] for hashed in manifest.values()}
+            logger.info(f"Serving {len(manifest)} hashed assets from {dist_dir}")
+        else:
+            root, template = backend_dir / "static", backend_dir / "templates" / "index.html"
+
+        pages = {"index.html": _load_file(template)}
+        for name in ROOT_FILES:
+            pages[name] = _load_file(root / name)
+        return cls(pages, static, immutable)
+
+    @staticmethod
+    def _load_tree(static_dir: Path) -> Dict[str, EncodedResponse]:
+        return {
+            path.relative_to(static_dir).as_posix(): _load_file(path)
+            for path in static_dir.rglob("*")
+            if path.is_file() and path.suffix not in (".gz", ".br")
+        }
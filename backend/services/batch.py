@@ -0,0 +1,200 @@
+"""
+Vectorized feasibility evaluation of many inventories against all recipes.
+
+Requires NumPy. For each recipe with ingredient slots S and every non-empty
+subset T of S, the number of inventory units that fit some category in T must be
+at least ``k * |T|`` for the recipe to be cookable ``k`` times (Hall's condition
+for the slot/item transportation problem). So
+
+    max_cooks = min over T of floor(supply(T) / |T|)
+
+A recipe whose ``count`` exceeds its slots needs that many ingredients per
+cook, so the total units also cap it at floor(total / count).
+
+Recipes with the same slots share one group of subsets, and subsets with the
+same item union share one supply column, so the tables grow with the number of
+distinct category combinations rather than with the recipe count. Inventories
+hold a handful of items each, so they are kept sparse: every (inventory, item,
+count) entry adds its count to the union columns containing the item, found
+through an item -> unions index in CSR form. Nothing is ever sized
+inventories x items.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from itertools import chain
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from backend.services.matching import iter_bits
+
+# Rows per chunk; batches larger than PARALLEL_THRESHOLD are spread across processes
+CHUNK_SIZE = 10_000
+PARALLEL_THRESHOLD = 20_000
+# Cap on rows x subset columns materialized at once in max_cooks
+BLOCK_ELEMENTS = 4_000_000
+# Counts are clipped so per-column supply sums stay exact in float64 (bincount weights)
+MAX_COUNT = np.iinfo(np.int32).max
+
+
+@dataclass(frozen=True)
+class EncodedInventories:
+    """Sparse (inventory, item, count) entries of ``size`` inventories."""
+    size: int
+    rows: np.ndarray
+    items: np.ndarray
+    counts: np.ndarray
+
+
+class BatchEvaluator:
+    """Membership tables for one data version, encoded as NumPy arrays."""
+
+    def __init__(self, item_ids: Dict[str, int], recipes: Dict[str, Sequence[int]],
+                 required: Optional[Dict[str, int]] = None):
+        """
+        ``item_ids`` maps item names to column indexes and ``recipes`` maps recipe
+        names to the item bitset of each of their ingredient slots. ``required``
+        maps recipe names to the ingredients one cook takes (default: one per slot).
+        """
+        required = required or {}
+        self.item_ids = item_ids
+        self.recipe_names: List[str] = [name for name, slots in recipes.items() if slots]
+
+        unions: Dict[int, int] = {}
+        groups: Dict[Tuple, int] = {}
+        group_required: List[int] = []
+        columns: List[int] = []
+        sizes: List[int] = []
+        starts: List[int] = []
+        recipe_groups: List[int] = []
+        for name in self.recipe_names:
+            slots = tuple(recipes[name])
+            count = max(len(slots), required.get(name, 0))
+            group = groups.get((slots, count))
+            if group is None:
+                group = groups[(slots, count)] = len(starts)
+                group_required.append(count)
+                starts.append(len(columns))
+                for subset in range(1, 1 << len(slots)):
+                    union = 0
+                    for pos, mask in enumerate(slots):
+                        if subset >> pos & 1:
+                            union |= mask
+                    columns.append(unions.setdefault(union, len(unions)))
+                    sizes.append(bin(subset).count("1"))
+            recipe_groups.append(group)
+
+        # item -> distinct union columns containing it
+        members: List[List[int]] = [[] for _ in range(len(item_ids))]
+        for union, column in unions.items():
+            for item in iter_bits(union):
+                members[item].append(column)
+        self.item_offsets = np.zeros(len(item_ids) + 1, dtype=np.int64)
+        np.cumsum([len(columns_of) for columns_of in members], out=self.item_offsets[1:])
+        self.item_unions = np.fromiter(chain.from_iterable(members), dtype=np.int64,
+                                       count=int(self.item_offsets[-1]))
+        self.n_unions = len(unions)
+        self.subset_columns = np.asarray(columns, dtype=np.intp)
+        self.subset_sizes = np.asarray(sizes, dtype=np.int64)
+        self.group_starts = np.asarray(starts, dtype=np.intp)
+        self.group_required = np.asarray(group_required, dtype=np.int64)
+        self.recipe_groups = np.asarray(recipe_groups, dtype=np.intp)
+
+    def encode(self, inventories: Sequence[Dict[str, int]]) -> EncodedInventories:
+        """
+        Encode inventories as sparse entries.
+
+        Unknown items are ignored and counts above MAX_COUNT are clipped.
+        """
+        rows: List[int] = []
+        items: List[int] = []
+        counts: List[int] = []
+        item_ids = self.item_ids
+        for row, inventory in enumerate(inventories):
+            for item, count in inventory.items():
+                col = item_ids.get(item)
+                if col is not None and count > 0:
+                    rows.append(row)
+                    items.append(col)
+                    counts.append(min(count, MAX_COUNT))
+        return EncodedInventories(len(inventories), np.asarray(rows, dtype=np.int64),
+                                  np.asarray(items, dtype=np.int64),
+                                  np.asarray(counts, dtype=np.float64))
+
+    def supply(self, encoded: EncodedInventories) -> np.ndarray:
+        """Return an (inventories x distinct unions) matrix of units fitting each union."""
+        starts = self.item_offsets[encoded.items]
+        lengths = self.item_offsets[encoded.items + 1] - starts
+        entries = np.repeat(np.arange(len(starts)), lengths)
+        # Position of every (entry, union) pair inside item_unions
+        within = np.arange(int(lengths.sum())) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+        columns = self.item_unions[starts[entries] + within]
+        flat = encoded.rows[entries] * self.n_unions + columns
+        supply = np.bincount(flat, weights=encoded.counts[entries],
+                             minlength=encoded.size * self.n_unions)
+        return supply.astype(np.int64).reshape(encoded.size, self.n_unions)
+
+    def max_cooks(self, encoded: EncodedInventories) -> np.ndarray:
+        """Return an (inventories x recipes) matrix of how many times each recipe can be cooked."""
+        cooks = np.zeros((encoded.size, len(self.recipe_names)), dtype=np.int64)
+        if not self.recipe_names or not encoded.size:
+            return cooks
+        supply = self.supply(encoded)
+        totals = np.bincount(encoded.rows, weights=encoded.counts,
+                             minlength=encoded.size).astype(np.int64)
+        block = max(1, BLOCK_ELEMENTS // len(self.subset_columns))
+        for start in range(0, encoded.size, block):
+            per_subset = supply[start:start + block, self.subset_columns] // self.subset_sizes
+            groups = np.minimum.reduceat(per_subset, self.group_starts, axis=1)
+            groups = np.minimum(groups, totals[start:start + block, None] // self.group_required)
+            cooks[start:start + block] = groups[:, self.recipe_groups]
+        return cooks
+
+    def evaluate_chunk(self, inventories: Sequence[Dict[str, int]]) -> np.ndarray:
+        return self.max_cooks(self.encode(inventories))
+
+    def evaluate(self, inventories: Sequence[Dict[str, int]],
+                 processes: Optional[int] = None) -> np.ndarray:
+        """
+        Evaluate a batch, using a process pool for batches above PARALLEL_THRESHOLD.
+
+        The pool is meant for offline jobs over very large batches; the HTTP
+        endpoint passes ``processes=1`` to force in-process evaluation.
+        """
+        chunks = [inventories[i:i + CHUNK_SIZE] for i in range(0, len(inventories), CHUNK_SIZE)]
+        if not chunks:
+            return np.zeros((0, len(self.recipe_names)), dtype=np.int64)
+        if processes == 1 or len(inventories) <= PARALLEL_THRESHOLD:
+            results = [self.evaluate_chunk(chunk) for chunk in chunks]
+        else:
+            workers = min(processes or os.cpu_count() or 1, len(chunks))
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=(self,)) as pool:
+                results = list(pool.map(_evaluate_in_worker, chunks))
+        return np.vstack(results)
+
+
+_worker_evaluator: Optional[BatchEvaluator] = None
+
+
+def _init_worker(evaluator: BatchEvaluator) -> None:
+    global _worker_evaluator
+    _worker_evaluator = evaluator
+
+
+def _evaluate_in_worker(chunk: Sequence[Dict[str, int]]) -> np.ndarray:
+    return _worker_evaluator.evaluate_chunk(chunk)
+
+
+def summarize(recipe_names: List[str], cooks: np.ndarray) -> Tuple[List[Dict], Dict[str, int]]:
+    """Turn a max-cooks matrix into per-inventory results and per-recipe feasible totals."""
+    results = []
+    for row in cooks:
+        nonzero = np.flatnonzero(row)
+        results.append({
+            "feasible": [recipe_names[i] for i in nonzero],
+            "counts": {recipe_names[i]: int(row[i]) for i in nonzero},
+        })
+    totals = dict(zip(recipe_names, (int(n) for n in np.count_nonzero(cooks, axis=0))))
+    return results, totals
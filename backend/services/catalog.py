@@ -0,0 +1,20 @@
+"""
+Immutable recipe catalog snapshot served by RecipeService.
+"""
+from dataclasses import dataclass
+from typing import Dict
+
+
+@dataclass(frozen=True)
+class Catalog:
+    """
+    Fully resolved recipe views for one version of the data files.
+
+    ``version`` is a content hash of the source JSON files, so two catalogs built
+    from identical data carry the same version. The views are shared between
+    requests and must be treated as read-only.
+    """
+    version: str
+    all_recipes: Dict[str, Dict]
+    shop_recipes: Dict[str, Dict]
+    stats: Dict
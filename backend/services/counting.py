@@ -0,0 +1,135 @@
+"""
+Exact counting of recipe ingredient combinations over overlapping categories.
+
+Categories share items (Bell Pepper is both Meat and Leafy), so the product of
+category sizes counts combinations that use one item for two slots. The
+functions here count only combinations of distinct items, without enumerating
+them, working on the per-slot item bitsets. Results are Python ints, so they
+are exact at any size.
+"""
+from functools import lru_cache
+from math import comb, factorial
+from typing import Dict, List, Sequence, Tuple
+
+
+def _popcount(mask: int) -> int:
+    return bin(mask).count("1")
+
+
+@lru_cache(maxsize=None)
+def _partitions(slots: int) -> Tuple[Tuple[int, Tuple[int, ...]], ...]:
+    """
+    Every set partition of ``slots`` slots with its Möbius coefficient.
+
+    Each entry is ``(mu, blocks)`` with blocks as slot bitmasks and
+    mu = prod((-1)^(|B|-1) * (|B|-1)!) over the blocks.
+    """
+    result = []
+
+    def extend(remaining: int, blocks: List[int]) -> None:
+        if not remaining:
+            mu = 1
+            for block in blocks:
+                size = _popcount(block)
+                mu *= (-1) ** (size - 1) * factorial(size - 1)
+            result.append((mu, tuple(blocks)))
+            return
+        # The lowest remaining slot starts the next block; choose its companions
+        first = remaining & -remaining
+        rest = remaining ^ first
+        companions = rest
+        while True:
+            blocks.append(first | companions)
+            extend(rest ^ companions, blocks)
+            blocks.pop()
+            if not companions:
+                break
+            companions = (companions - 1) & rest
+
+    extend((1 << slots) - 1, [])
+    return tuple(result)
+
+
+def _intersection_sizes(slot_masks: Sequence[int]) -> List[int]:
+    """Number of items accepted by every slot in each slot subset, indexed by subset bitmask."""
+    intersections = [0] * (1 << len(slot_masks))
+    intersections[0] = -1
+    for subset in range(1, len(intersections)):
+        low = subset & -subset
+        intersections[subset] = intersections[subset ^ low] & slot_masks[low.bit_length() - 1]
+    return [_popcount(mask) if subset else 0 for subset, mask in enumerate(intersections)]
+
+
+def count_assignments(slot_masks: Sequence[int]) -> int:
+    """
+    Count slot-to-item assignments that use a different item for every slot.
+
+    Inclusion–exclusion over set partitions of the slots: each partition
+    contributes mu(partition) * prod(|intersection of the block's categories|).
+    Cost depends only on the number of slots (Bell(k) terms), not on how many
+    items the categories hold.
+    """
+    if not slot_masks:
+        return 1
+    sizes = _intersection_sizes(slot_masks)
+    total = 0
+    for mu, blocks in _partitions(len(slot_masks)):
+        term = mu
+        for block in blocks:
+            term *= sizes[block]
+            if not term:
+                break
+        total += term
+    return total
+
+
+def _has_matching(types: Sequence[int], slots: int) -> bool:
+    """Hall's condition: every slot subset is reachable by at least as many chosen items."""
+    for subset in range(1, 1 << slots):
+        if sum(1 for signature in types if signature & subset) < _popcount(subset):
+            return False
+    return True
+
+
+def count_item_sets(slot_masks: Sequence[int]) -> int:
+    """
+    Count distinct unordered sets of items that can fill all slots, one item each.
+
+    Items accepted by exactly the same slots are interchangeable, so items are
+    grouped by that slot signature and only the number drawn from each group is
+    enumerated; each feasible draw contributes a product of binomials.
+    """
+    slots = len(slot_masks)
+    if not slots:
+        return 1
+    full = (1 << slots) - 1
+    groups: Dict[int, int] = {}
+    for signature in range(1, full + 1):
+        inside, outside = -1, 0
+        for slot, mask in enumerate(slot_masks):
+            if signature >> slot & 1:
+                inside &= mask
+            else:
+                outside |= mask
+        size = _popcount(inside & ~outside)
+        if size:
+            groups[signature] = size
+    signatures = sorted(groups)
+
+    total = 0
+
+    def draw(index: int, left: int, chosen: List[int], ways: int) -> None:
+        nonlocal total
+        if not left:
+            if _has_matching(chosen, slots):
+                total += ways
+            return
+        if index == len(signatures):
+            return
+        signature = signatures[index]
+        size = groups[signature]
+        for count in range(min(left, size) + 1):
+            draw(index + 1, left - count, chosen + [signature] * count, ways * comb(size, count))
+
+    draw(0, slots, [], 1)
+    return total
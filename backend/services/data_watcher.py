@@ -0,0 +1,89 @@
+"""
+Background polling of the data directory for hot reloads.
+"""
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+WATCHED_FILES = (
+    "recipes.json",
+    "cooking.json",
+    "plant_traits.json",
+    "shopseeds.json",
+    "metadata.json",
+)
+
+FileSignature = Optional[Tuple[int, int, int, int]]
+
+
+class DataWatcher:
+    """
+    Poll data files for (inode, device, size, mtime) changes and call ``on_change``.
+
+    A change is only reported once the signature has been stable for one full
+    polling interval, so a converter that is still writing files does not trigger
+    a reload of half-written data. ``on_change`` returns False when the reload
+    failed; the change is then retried on the next poll.
+    """
+
+    def __init__(self, data_dir: str, on_change: Callable[[], bool], interval: float = 5.0):
+        self.data_dir = Path(data_dir)
+        self.on_change = on_change
+        self.interval = interval
+        self._applied = self._signature()
+        self._pending: Optional[Dict[str, FileSignature]] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _signature(self) -> Dict[str, FileSignature]:
+        signature = {}
+        for name in WATCHED_FILES:
+            try:
+                st = os.stat(self.data_dir / name)
+                signature[name] = (st.st_ino, st.st_dev, st.st_size, st.st_mtime_ns)
+            except OSError:
+                signature[name] = None
+        return signature
+
+    def check(self) -> bool:
+        """Run one polling step; return True if a reload was triggered and succeeded."""
+        current = self._signature()
+        if current == self._applied:
+            self._pending = None
+            return False
+        if current != self._pending:
+            # First sighting (or still changing): wait for it to settle
+            self._pending = current
+            return False
+
+        try:
+            reloaded = self.on_change()
+        except Exception as e:
+            logger.error(f"Data reload failed: {e}")
+            reloaded = False
+        if reloaded:
+            self._applied = current
+            self._pending = None
+        return reloaded
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.check()
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="data-watcher", daemon=True)
+        self._thread.start()
+        logger.info(f"Watching {self.data_dir} for data changes every {self.interval}s")
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=self.interval + 1)
+            self._thread = None
@@ -0,0 +1,155 @@
+"""
+Bounded history of loaded datasets, for serving deltas between revisions.
+
+Every distinct dataset the server serves gets a revision number that only
+increases. For each recent revision the history keeps the parts clients sync
+(resolved recipes, category members, traits, shop seeds), which share their
+objects with the service that produced them, so an entry costs little beyond
+the dataset itself.
+"""
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+from backend.services.recipe_service import RecipeService
+from backend.services.version_store import RevisionLog, VersionStore
+
+logger = logging.getLogger(__name__)
+
+SECTIONS = ("recipes", "categories", "traits", "shop_seeds")
+
+
+def dataset_state(service: RecipeService) -> Dict[str, Dict]:
+    """The syncable view of a service, as one mapping per section."""
+    return {
+        "recipes": service.get_all_recipes(),
+        "categories": {category: list(items) for category, items in service._category_items.items()},
+        "traits": service.traits_data,
+        "shop_seeds": dict.fromkeys(service.shop_seeds, True),
+    }
+
+
+def _diff_members(old: List[str], new: List[str]) -> Dict[str, List[str]]:
+    old_set, new_set = set(old), set(new)
+    return {
+        "added": [item for item in new if item not in old_set],
+        "removed": [item for item in old if item not in new_set],
+    }
+
+
+def diff_states(old: Dict[str, Dict], new: Dict[str, Dict]) -> Dict[str, Dict]:
+    """
+    Added, removed and changed entries per section between two states.
+
+    Category changes list the members added and removed; shop seeds are a flat
+    ``{"added": [...], "removed": [...]}``.
+    """
+    delta = {}
+    for section in SECTIONS:
+        before, after = old.get(section, {}), new.get(section, {})
+        if section == "shop_seeds":
+            delta[section] = _diff_members(list(before), list(after))
+            continue
+        changed = {}
+        for key, value in after.items():
+            if key in before and before[key] != value:
+                changed[key] = (_diff_members(before[key], value) if section == "categories"
+                                else value)
+        delta[section] = {
+            "added": {key: value for key, value in after.items() if key not in before},
+            "removed": [key for key in before if key not in after],
+            "changed": changed,
+        }
+    return delta
+
+
+class DatasetHistory:
+    """
+    States of the most recent ``maxsize`` datasets, by persistent revision.
+
+    Revisions are read from the converter's RevisionLog (see
+    services/version_store.py), so they keep increasing across restarts and
+    agree between worker processes; nothing here writes to disk. States older
+    than the in-memory window are rebuilt from the version store when it has
+    them. A dataset missing from the log (e.g. edited by hand) is revision 0,
+    and every delta to it is a reset.
+    """
+
+    def __init__(self, maxsize: int = 16, store: Optional[VersionStore] = None,
+                 log: Optional[RevisionLog] = None):
+        self.maxsize = maxsize
+        self.store = store
+        self.log = log
+        self._states: "OrderedDict[int, Dict]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def revision(self) -> int:
+        """Latest recorded revision (0 before anything is recorded)."""
+        return next(reversed(self._states), 0)
+
+    def _resolve(self, service: RecipeService) -> int:
+        """Look up a service's revision in the log once it is there (the converter may lag a reload)."""
+        if not service.revision and self.log is not None:
+            try:
+                service.revision = self.log.revision_of(service.data_version)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Cannot read revision log {self.log.path}: {e}")
+        return service.revision
+
+    def record(self, service: RecipeService) -> int:
+        """Add a service's dataset, set ``service.revision`` and return it."""
+        revision = self._resolve(service)
+        if revision:
+            with self._lock:
+                self._states[revision] = dataset_state(service)
+                self._states.move_to_end(revision)
+                while len(self._states) > self.maxsize:
+                    self._states.popitem(last=False)
+        return revision
+
+    def known(self, since: int, service: RecipeService) -> bool:
+        """Whether ``since`` is a revision ``service`` can be diffed against."""
+        if not 0 < since <= self._resolve(service):
+            return False
+        if since == service.revision:
+            return True
+        with self._lock:
+            if since in self._states:
+                return True
+        version_id = self.log.version_of(since) if self.log is not None else None
+        return version_id is not None and self.store is not None and self.store.resolve(version_id) is not None
+
+    def _state(self, revision: int, service: RecipeService) -> Optional[Dict]:
+        if revision == service.revision:
+            return dataset_state(service)
+        with self._lock:
+            state = self._states.get(revision)
+        if state is not None or self.store is None or self.log is None:
+            return state
+        try:
+            version_id = self.log.version_of(revision)
+            old = self.store.service(version_id) if version_id else None
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Cannot rebuild revision {revision}: {e}")
+            return None
+        return dataset_state(old) if old is not None else None
+
+    def changes(self, since: Optional[int], service: RecipeService) -> Dict:
+        """
+        Delta from revision ``since`` to the current service.
+
+        If ``since`` is unknown (None, 0, newer than the service or no longer
+        in the store) the delta is taken from an empty state, ``since`` is null
+        and ``reset`` is true: clients should replace rather than patch their copy.
+        """
+        old = (self._state(since, service)
+               if since is not None and self.known(since, service) else None)
+        return {
+            "since": since if old is not None else None,
+            "revision": service.revision,
+            "data_version": service.data_version,
+            "reset": old is None,
+            **diff_states(old or {}, dataset_state(service)),
+        }
@@ -0,0 +1,64 @@
+"""
+Bipartite matching of recipe ingredient slots to inventory items.
+"""
+from typing import Dict, List, Optional, Sequence
+
+
+def iter_bits(mask: int):
+    """
+    Yield the positions of set bits in ascending order.
+
+    Scans the binary string once: clearing bits one by one would copy the
+    whole int per bit, quadratic for masks over thousands of items.
+    """
+    bits = bin(mask)[:1:-1]
+    position = bits.find("1")
+    while position != -1:
+        yield position
+        position = bits.find("1", position + 1)
+
+
+def assign_slots(slot_masks: Sequence[int], capacities: Dict[int, int]) -> Optional[List[int]]:
+    """
+    Assign each slot a distinct unit of an item it accepts.
+
+    ``slot_masks[i]`` is the bitset of item IDs slot ``i`` accepts and
+    ``capacities`` maps item ID to how many units are available. Returns the
+    chosen item ID per slot, or None if no complete assignment exists. Uses
+    augmenting paths (Kuhn's algorithm with item capacities); recipes have only a
+    handful of slots, so this is a few microseconds per call.
+    """
+    available = 0
+    for item, count in capacities.items():
+        if count > 0:
+            available |= 1 << item
+    candidates = [mask & available for mask in slot_masks]
+    if any(not mask for mask in candidates):
+        return None
+
+    assignment = [-1] * len(slot_masks)
+    holders: Dict[int, List[int]] = {}
+
+    def augment(slot: int, seen: set) -> bool:
+        for item in iter_bits(candidates[slot]):
+            if item in seen:
+                continue
+            seen.add(item)
+            used = holders.setdefault(item, [])
+            if len(used) < capacities[item]:
+                used.append(slot)
+                assignment[slot] = item
+                return True
+            for other in list(used):
+                if augment(other, seen):
+                    used.remove(other)
+                    used.append(slot)
+                    assignment[slot] = item
+                    return True
+        return False
+
+    # Most constrained slots first keeps augmenting paths short
+    for slot in sorted(range(len(slot_masks)), key=lambda s: bin(candidates[s]).count("1")):
+        if not augment(slot, set()):
+            return None
+    return assignment
@@ -1,15 +1,74 @@
 """
 Recipe service for managing food recipes and resolving ingredient categories.
 """
+import hashlib
+import heapq
 import json
 import logging
+from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from backend.services.catalog import Catalog
+from backend.services.counting import count_assignments, count_item_sets
+from backend.services.metrics import DATA_LOAD_SECONDS
+from backend.services.matching import assign_slots, iter_bits
+from backend.services.response_cache import EncodedResponse, ResponseCache
+from backend.services.search import SearchIndex
+from backend.services.snapshot import SNAPSHOT_FILE, read_snapshot, write_snapshot as write_snapshot_file
 
 logger = logging.getLogger(__name__)
 
+# Responses keyed by a request parameter (an item, a recipe, a filter) are
+# cached apart from the handful of standard ones so they cannot evict them
+DETAIL_CACHE_SIZE = 512
+
 class RecipeService:
-    def __init__(self, data_dir: str = None):
+    # Where each simple category draws its items from: ("fixed", key) reads the
+    # cooking.json list, ("trait", key) reads plant_traits.json. Composite
+    # categories (HerbalBase, Filling, Main, Any) are built in _build_trait_index.
+    CATEGORY_SOURCES: Dict[str, Tuple[str, str]] = {
+        "Bread": ("fixed", "Bread"),
+        "Meat": ("fixed", "Meat"),
+        "Leafy": ("fixed", "Leafy"),
+        "Pastry": ("fixed", "Pastry"),
+        "Tomato": ("fixed", "Tomato"),
+        "Fruit": ("trait", "Fruit"),
+        "Vegetable": ("trait", "Vegetable"),
+        "Sweet": ("trait", "Sweet"),
+        "Sauce": ("trait", "Fruit"),
+        "Cone": ("fixed", "Bread"),
+        "Cream": ("trait", "Sweet"),
+        "Base": ("fixed", "Bread"),
+        "Stick": ("trait", "Woody"),
+        "Icing": ("trait", "Sweet"),
+        "Sprinkles": ("trait", "Sweet"),
+        "CandyCoating": ("trait", "Sweet"),
+        "Sweetener": ("trait", "Sweet"),
+        "Bamboo": ("fixed", "Bamboo"),
+        "Wrap": ("fixed", "Wrap"),
+        "Rice": ("fixed", "Rice"),
+        "Woody": ("trait", "Woody"),
+        "Apple": ("fixed", "Apple"),
+        "Batter": ("fixed", "Batter"),
+        "Pasta": ("fixed", "Pasta"),
+        "Vegetables": ("trait", "Vegetable"),
+    }
+
+    # Source files in content-hash order (must match _load_data)
+    SOURCE_FILES = ("recipes.json", "cooking.json", "plant_traits.json",
+                    "shopseeds.json", "metadata.json")
+
+    DISPLAY_NAMES: Dict[str, str] = {
+        "CandyApple": "Candy Apple",
+        "HotDog": "Hot Dog",
+        "IceCream": "Ice Cream",
+        "SweetTea": "Sweet Tea",
+        "Corndog": "Corn Dog"
+    }
+
+    def __init__(self, data_dir: str = None, use_snapshot: bool = True,
+                 snapshot_path: Optional[Path] = None, sources: Optional[Dict] = None):
         if data_dir:
             self.data_dir = Path(data_dir)
         else:
@@ -19,43 +78,226 @@ class RecipeService:
         self.traits_data: Dict = {}
         self.shop_seeds: List[str] = []
         self.category_to_items: Dict[str, List[str]] = {}
-        self._load_data()
-        self._build_category_mapping()
+        self.item_names: List[str] = []
+        self.item_ids: Dict[str, int] = {}
+        self.trait_masks: Dict[str, int] = {}
+        self.category_masks: Dict[str, int] = {}
+        self.shop_mask: int = 0
+        self._category_items: Dict[str, Tuple[str, ...]] = {}
+        self.metadata: Dict = {}
+        self.data_version: str = ""
+        # Persistent revision, assigned when the dataset is served (see services/history.py)
+        self.revision: int = 0
+        self.load_error: Optional[str] = None
+        self.catalog: Catalog
+        self._recipe_keys: Dict[str, str] = {}
+        self._recipe_slots: Dict[str, Tuple[Tuple[str, int], ...]] = {}
+        self._batch_evaluator = None
+        self.category_bits: Dict[str, int] = {}
+        self._item_category_masks: List[int] = []
+        self._cook_buckets: Dict[int, List[Tuple]] = {}
+        self._item_keys: Dict[str, str] = {}
+        self._category_recipes: List[Tuple[str, ...]] = []
+        self._recipe_ranks: Dict[str, int] = {}
+        self.search_index: Optional[SearchIndex] = None
+        self.response_cache = ResponseCache()
+        self.detail_cache = ResponseCache(DETAIL_CACHE_SIZE)
+        with DATA_LOAD_SECONDS.time("total"):
+            with DATA_LOAD_SECONDS.time("snapshot"):
+                if sources is not None:
+                    loaded = False
+                elif snapshot_path is not None:
+                    # Published by a trusted loader process; no source check
+                    loaded = self._load_snapshot(Path(snapshot_path), verify=False)
+                else:
+                    loaded = use_snapshot and self._load_snapshot()
+            if not loaded:
+                with DATA_LOAD_SECONDS.time("json"):
+                    if sources is not None:
+                        self._load_sources(sources)
+                    else:
+                        self._load_data()
+                    self._build_category_mapping()
+                with DATA_LOAD_SECONDS.time("index"):
+                    self._build_trait_index()
+                with DATA_LOAD_SECONDS.time("catalog"):
+                    self._build_catalog()
     
     def _load_data(self) -> None:
-        """Load recipe, cooking, and traits data from JSON files."""
+        """Load recipe, cooking, traits, and metadata JSON files and hash their contents."""
+        hasher = hashlib.sha256()
         try:
             # Load recipes data
             recipes_file = self.data_dir / "recipes.json"
             if recipes_file.exists():
-                with open(recipes_file, 'r', encoding='utf-8') as f:
-                    self.recipes_data = json.load(f)
+                self.recipes_data = self._read_json(recipes_file, hasher)
                 logger.info(f"Loaded {len(self.recipes_data)} recipes")
             
             # Load cooking data
             cooking_file = self.data_dir / "cooking.json"
             if cooking_file.exists():
-                with open(cooking_file, 'r', encoding='utf-8') as f:
-                    self.cooking_data = json.load(f)
+                self.cooking_data = self._read_json(cooking_file, hasher)
                 logger.info(f"Loaded {len(self.cooking_data)} cooking categories")
             
             # Load traits data
             traits_file = self.data_dir / "plant_traits.json"
             if traits_file.exists():
-                with open(traits_file, 'r', encoding='utf-8') as f:
-                    self.traits_data = json.load(f)
+                self.traits_data = self._read_json(traits_file, hasher)
                 logger.info(f"Loaded {len(self.traits_data)} plants with traits")
             
             # Load shop seeds data
             shop_seeds_file = self.data_dir / "shopseeds.json"
             if shop_seeds_file.exists():
-                with open(shop_seeds_file, 'r', encoding='utf-8') as f:
-                    shop_seeds_data = json.load(f)
-                    self.shop_seeds = shop_seeds_data.get("shopseeds", [])
+                shop_seeds_data = self._read_json(shop_seeds_file, hasher)
+                self.shop_seeds = shop_seeds_data.get("shopseeds", [])
                 logger.info(f"Loaded {len(self.shop_seeds)} shop seeds")
             
+            # Load metadata (last updated time)
+            metadata_file = self.data_dir / "metadata.json"
+            if metadata_file.exists():
+                try:
+                    self.metadata = self._read_json(metadata_file, hasher)
+                except ValueError:
+                    self.metadata = {}
+            
         except Exception as e:
             logger.error(f"Failed to load recipe data: {e}")
+            self.load_error = str(e)
+        self.data_version = hasher.hexdigest()
+
+    def _load_sources(self, sources: Dict) -> None:
+        """Take source data already in memory (e.g. a stored version, see services/version_store.py)."""
+        self.recipes_data = sources["recipes_data"]
+        self.cooking_data = sources["cooking_data"]
+        self.traits_data = sources["traits_data"]
+        self.shop_seeds = sources["shop_seeds"]
+        self.metadata = sources["metadata"]
+        self.data_version = sources["data_version"]
+
+    def _content_hash(self) -> str:
+        """Hash the source files exactly as _load_data does, without parsing them."""
+        hasher = hashlib.sha256()
+        for name in self.SOURCE_FILES:
+            path = self.data_dir / name
+            if path.exists():
+                hasher.update(name.encode("utf-8") + b"\0" + path.read_bytes())
+        return hasher.hexdigest()
+
+    def _load_snapshot(self, path: Optional[Path] = None, verify: bool = True) -> bool:
+        """Load a compiled snapshot if one exists and (when ``verify``) matches the source files."""
+        payload = read_snapshot(path or self.data_dir / SNAPSHOT_FILE)
+        if payload is None:
+            return False
+        if verify and payload["data_version"] != self._content_hash():
+            logger.info("Snapshot is stale, loading JSON data")
+            return False
+
+        self.recipes_data = payload["recipes_data"]
+        self.cooking_data = payload["cooking_data"]
+        self.traits_data = payload["traits_data"]
+        self.shop_seeds = payload["shop_seeds"]
+        self.metadata = payload["metadata"]
+        self.data_version = payload["data_version"]
+        self.category_to_items = dict(self.cooking_data)
+        self.item_names = payload["item_names"]
+        self.item_ids = {name: i for i, name in enumerate(self.item_names)}
+        self.trait_masks = payload["trait_masks"]
+        self.category_masks = payload["category_masks"]
+        self.shop_mask = payload["shop_mask"]
+        self._category_items = payload["category_items"]
+        self._build_recipe_index()
+        self.catalog = Catalog(
+            version=self.data_version,
+            all_recipes=payload["all_recipes"],
+            shop_recipes=payload["shop_recipes"],
+            stats=payload["stats"],
+        )
+        # Response bodies stay in the mapped file, shared by every process that maps it
+        blobs = payload["blobs"]
+        for key, body, gzip_body, br_body, etag in payload.get("responses", ()):
+            self.response_cache.put((self.data_version, key), EncodedResponse(
+                blobs[body],
+                blobs[gzip_body] if gzip_body is not None else None,
+                blobs[br_body] if br_body is not None else None,
+                etag))
+        logger.info(f"Loaded snapshot {self.data_version[:12]} ({len(self.item_names)} items)")
+        return True
+
+    def snapshot_payload(self, include_responses: bool = False) -> Tuple[Dict, List[bytes]]:
+        """
+        Everything _load_snapshot needs, as marshal-friendly primitives plus blobs.
+
+        With ``include_responses`` the standard API responses are encoded and
+        shipped too, so processes loading the snapshot skip serialization. Their
+        bodies go in the blob list, referenced from the payload by index.
+        """
+        payload = {
+            "recipes_data": self.recipes_data,
+            "cooking_data": self.cooking_data,
+            "traits_data": self.traits_data,
+            "shop_seeds": self.shop_seeds,
+            "metadata": self.metadata,
+            "item_names": self.item_names,
+            "trait_masks": self.trait_masks,
+            "category_masks": self.category_masks,
+            "shop_mask": self.shop_mask,
+            "category_items": self._category_items,
+            "all_recipes": self.catalog.all_recipes,
+            "shop_recipes": self.catalog.shop_recipes,
+            "stats": self.catalog.stats,
+        }
+        blobs: List[bytes] = []
+
+        def blob(data: Optional[bytes]) -> Optional[int]:
+            if data is None:
+                return None
+            blobs.append(data)
+            return len(blobs) - 1
+
+        if include_responses:
+            payload["responses"] = [
+                (key, blob(encoded.body), blob(encoded.gzip), blob(encoded.br), encoded.etag)
+                for key, encoded in self.warm_response_cache().items()
+            ]
+        return payload, blobs
+
+    def write_snapshot(self, path: Optional[Path] = None, include_responses: bool = False) -> Path:
+        """Compile the loaded dataset into a binary snapshot (default: data_dir/snapshot.bin)."""
+        path = Path(path) if path else self.data_dir / SNAPSHOT_FILE
+        payload, blobs = self.snapshot_payload(include_responses)
+        write_snapshot_file(path, self.data_version, payload, blobs)
+        return path
+
+    @staticmethod
+    def recipes_cache_key(shop_only: bool, format: str = "full",
+                          fields: Optional[List[str]] = None,
+                          names: Optional[List[str]] = None,
+                          seeds: Optional[List[str]] = None) -> Tuple:
+        """Response-cache key for an /api/recipes variant (lists must be canonical/sorted)."""
+        return ("recipes", shop_only, format,
+                tuple(fields) if fields is not None else None,
+                tuple(names) if names is not None else None,
+                tuple(seeds) if seeds is not None else None)
+
+    def warm_response_cache(self) -> Dict[Tuple, EncodedResponse]:
+        """Encode the standard /api/recipes, /api/stats and /api/items responses."""
+        builders = {
+            self.recipes_cache_key(False): lambda: self.get_recipes_view(False),
+            self.recipes_cache_key(True): lambda: self.get_recipes_view(True),
+            "stats": self.get_stats,
+            "items": self.get_items,
+        }
+        return {
+            key: self.response_cache.get_or_build((self.data_version, key), build)
+            for key, build in builders.items()
+        }
+
+    @staticmethod
+    def _read_json(path: Path, hasher) -> Dict:
+        """Read a JSON file, feeding its name and raw bytes into the content hash."""
+        raw = path.read_bytes()
+        hasher.update(path.name.encode("utf-8") + b"\0" + raw)
+        return json.loads(raw)
     
     def _build_category_mapping(self) -> None:
         """Build reverse mapping: category -> items from cooking.json."""
@@ -66,96 +308,220 @@ class RecipeService:
             logger.error(f"Failed to build category mapping: {e}")
             self.category_to_items = {}
     
+    def _build_trait_index(self) -> None:
+        """
+        Intern every known item and build per-trait and per-category bitsets.
+
+        Bit ``i`` of a mask refers to ``self.item_names[i]``; IDs are assigned in
+        sorted name order so decoding a mask yields a sorted item list.
+        """
+        try:
+            names = set(self.traits_data.keys())
+            for items in self.category_to_items.values():
+                names.update(items)
+            self.item_names = sorted(names)
+            self.item_ids = {name: i for i, name in enumerate(self.item_names)}
+
+            trait_masks: Dict[str, int] = {}
+            for item, traits in self.traits_data.items():
+                bit = 1 << self.item_ids[item]
+                for trait in traits:
+                    trait_masks[trait] = trait_masks.get(trait, 0) | bit
+            self.trait_masks = trait_masks
+
+            fixed_masks = {cat: self._items_to_mask(items)
+                           for cat, items in self.category_to_items.items()}
+
+            def source_mask(kind: str, key: str) -> int:
+                if kind == "fixed":
+                    return fixed_masks.get(key, 0)
+                return trait_masks.get(key, 0)
+
+            vegetable = trait_masks.get("Vegetable", 0)
+            meat = fixed_masks.get("Meat", 0)
+            herbalbase = trait_masks.get("Flower", 0) & ~trait_masks.get("Toxic", 0)
+            if "Mint" in self.traits_data:
+                herbalbase |= 1 << self.item_ids["Mint"]
+            composites = {
+                "HerbalBase": herbalbase,
+                "Filling": vegetable | meat,
+                "Main": vegetable | meat,
+                "Any": self._items_to_mask(self.traits_data.keys()),
+            }
+
+            category_masks: Dict[str, int] = {}
+            for cat, (kind, key) in self.CATEGORY_SOURCES.items():
+                category_masks[cat] = source_mask(kind, key)
+            category_masks.update(composites)
+            # Merge with cooking.json fixed items for every category
+            for cat, mask in fixed_masks.items():
+                category_masks[cat] = category_masks.get(cat, 0) | mask
+            self.category_masks = category_masks
+            self.shop_mask = self._items_to_mask(self.shop_seeds)
+            self._category_items = {cat: tuple(self._mask_to_items(mask))
+                                    for cat, mask in category_masks.items()}
+            logger.info(f"Indexed {len(self.item_names)} items across "
+                        f"{len(trait_masks)} traits and {len(category_masks)} categories")
+        except Exception as e:
+            logger.error(f"Failed to build trait index: {e}")
+            self.item_names, self.item_ids = [], {}
+            self.trait_masks, self.category_masks, self._category_items = {}, {}, {}
+            self.shop_mask = 0
+
+    def _items_to_mask(self, items) -> int:
+        """Encode item names as a bitset over interned item IDs, ignoring unknown names."""
+        mask = 0
+        for item in items:
+            item_id = self.item_ids.get(item)
+            if item_id is not None:
+                mask |= 1 << item_id
+        return mask
+
+    def _mask_to_items(self, mask: int) -> List[str]:
+        """Decode a bitset back into a sorted list of item names."""
+        names = self.item_names
+        return [names[item_id] for item_id in iter_bits(mask)]
+
     def resolve_trait(self, trait: str) -> List[str]:
         """Return all items in traits.json that have a given trait."""
-        return [item for item, ts in self.traits_data.items() if trait in ts]
+        return self._mask_to_items(self.trait_masks.get(trait, 0))
     
     def resolve_herbalbase(self) -> List[str]:
         """Return flowers that are not toxic, plus Mint if available."""
-        items = [item for item, ts in self.traits_data.items() 
-                 if "Flower" in ts and "Toxic" not in ts]
-        if "Mint" in self.traits_data:
-            items.append("Mint")
-        return list(set(items))
+        return self.resolve_category("HerbalBase")
     
     def resolve_filling(self) -> List[str]:
         """Filling = all vegetables + meat items (composite category)."""
-        vegetable_items = self.resolve_trait("Vegetable")
-        meat_items = self.category_to_items.get("Meat", [])
-        return list(set(vegetable_items + meat_items))
+        return self.resolve_category("Filling")
+
+    def category_mask(self, cat: str) -> int:
+        """Return the precomputed item bitset for a category (0 if unknown)."""
+        return self.category_masks.get(cat, 0)
     
     def resolve_category(self, cat: str) -> List[str]:
         """
         Return all possible items for a category.
         Merges cooking.json fixed items and traits.json items for trait-based categories.
         """
-        # Category resolvers
-        CATEGORY_RESOLVERS = {
-            "Bread": lambda: self.category_to_items.get("Bread", []),
-            "Meat": lambda: self.category_to_items.get("Meat", []),
-            "Leafy": lambda: self.category_to_items.get("Leafy", []),
-            "Pastry": lambda: self.category_to_items.get("Pastry", []),
-            "Tomato": lambda: self.category_to_items.get("Tomato", []),
-            "Fruit": lambda: self.resolve_trait("Fruit"),
-            "Vegetable": lambda: self.resolve_trait("Vegetable"),
-            "Sweet": lambda: self.resolve_trait("Sweet"),
-            "Sauce": lambda: self.resolve_trait("Fruit"),
-            "Cone": lambda: self.category_to_items.get("Bread", []),
-            "Cream": lambda: self.resolve_trait("Sweet"),
-            "Base": lambda: self.category_to_items.get("Bread", []),
-            "Stick": lambda: self.resolve_trait("Woody"),
-            "Icing": lambda: self.resolve_trait("Sweet"),
-            "Sprinkles": lambda: self.resolve_trait("Sweet"),
-            "CandyCoating": lambda: self.resolve_trait("Sweet"),
-            "Sweetener": lambda: self.resolve_trait("Sweet"),
-            "HerbalBase": lambda: self.resolve_herbalbase(),
-            "Filling": lambda: self.resolve_filling(),
-            "Bamboo": lambda: self.category_to_items.get("Bamboo", []),
-            "Wrap": lambda: self.category_to_items.get("Wrap", []),
-            "Rice": lambda: self.category_to_items.get("Rice", []),
-            "Woody": lambda: self.resolve_trait("Woody"),
-            "Apple": lambda: self.category_to_items.get("Apple", []),
-            "Batter": lambda: self.category_to_items.get("Batter", []),
-            "Pasta": lambda: self.category_to_items.get("Pasta", []),
-            "Vegetables": lambda: self.resolve_trait("Vegetable"),
-            "Main": lambda: list(set(self.category_to_items.get("Meat", []) + self.resolve_trait("Vegetable"))),
-            "Any": lambda: list(self.traits_data.keys())
-        }
-        
-        resolver = CATEGORY_RESOLVERS.get(cat)
-        items = resolver() if callable(resolver) else []
-        
-        # Merge with cooking.json fixed items if not already included
-        fixed_items = self.category_to_items.get(cat, [])
-        return list(set(items) | set(fixed_items))
+        return list(self._category_items.get(cat, ()))
     
-    def get_all_recipes(self) -> Dict:
-        """Get all available recipes with their ingredient categories resolved."""
+    def _build_catalog(self) -> None:
+        """Resolve every recipe view once and freeze it into a versioned Catalog."""
+        self._build_recipe_index()
+        all_recipes = self._resolve_all_recipes()
+        shop_recipes = self._resolve_shop_only_recipes(all_recipes)
+        stats = {
+            "total_recipes": len(all_recipes),
+            "shop_only_recipes": len(shop_recipes),
+            "last_updated": self._last_updated(),
+            "data_version": self.data_version,
+        }
+        self.catalog = Catalog(
+            version=self.data_version,
+            all_recipes=all_recipes,
+            shop_recipes=shop_recipes,
+            stats=stats,
+        )
+        logger.info(f"Built catalog {self.data_version[:12]} "
+                    f"({len(all_recipes)} recipes, {len(shop_recipes)} shop-only)")
+
+    def _build_recipe_index(self) -> None:
+        """Index recipe names, per-recipe slot bitsets and the cook simulator buckets."""
+        self._recipe_keys = {}
+        self._recipe_slots = {}
+        for name, recipe in self.recipes_data.items():
+            self._recipe_keys[name.lower()] = name
+            self._recipe_keys[self.DISPLAY_NAMES.get(name, name).lower()] = name
+            self._recipe_slots[name] = tuple(
+                (category, self.category_mask(category))
+                for category in recipe.get("ingredients", {})
+            )
+        self._build_cook_index()
+        self._build_uses_index()
+        self.search_index = SearchIndex(
+            [("item", name) for name in self.item_names]
+            + [("recipe", self.DISPLAY_NAMES.get(name, name)) for name in self.recipes_data]
+        )
+
+    def _build_cook_index(self) -> None:
+        """
+        Index recipes for pot simulation.
+
+        Every category gets a bit, every item a mask of the categories it
+        satisfies, and recipes are bucketed by how many ingredients they need,
+        sorted by priority (highest first).
+        """
+        self.category_bits = {cat: 1 << i for i, cat in enumerate(sorted(self.category_masks))}
+        item_masks = [0] * len(self.item_names)
+        for cat, mask in self.category_masks.items():
+            bit = self.category_bits[cat]
+            for item_id in iter_bits(mask):
+                item_masks[item_id] |= bit
+        self._item_category_masks = item_masks
+
+        buckets: Dict[int, List[Tuple]] = {}
+        for name, slots in self._recipe_slots.items():
+            if not slots:
+                continue
+            recipe = self.recipes_data[name]
+            required = self.required_count(name)
+            category_mask = 0
+            for category, _ in slots:
+                category_mask |= self.category_bits.get(category, 0)
+            display_name = self.DISPLAY_NAMES.get(name, name)
+            buckets.setdefault(required, []).append(
+                (-recipe.get("priority", 0), display_name, name, category_mask)
+            )
+        for bucket in buckets.values():
+            bucket.sort()
+        self._cook_buckets = buckets
+
+    def _build_uses_index(self) -> None:
+        """
+        Index, per category bit, the recipes with a slot of that category (highest priority first).
+
+        An item's recipes are the union over the categories in its
+        ``_item_category_masks`` entry, so the index costs recipes x slots
+        rather than a pass over every item.
+        """
+        self._item_keys = {name.lower(): name for name in self.item_names}
+        ordered = sorted(self._recipe_slots,
+                         key=lambda name: (-self.recipes_data[name].get("priority", 0),
+                                           self.DISPLAY_NAMES.get(name, name)))
+        self._recipe_ranks = {name: rank for rank, name in enumerate(ordered)}
+        category_recipes: List[List[str]] = [[] for _ in self.category_bits]
+        for name in ordered:
+            for category, mask in self._recipe_slots[name]:
+                bit = self.category_bits.get(category, 0)
+                if mask and bit:
+                    category_recipes[bit.bit_length() - 1].append(name)
+        self._category_recipes = [tuple(names) for names in category_recipes]
+
+    def _item_recipes(self, item_id: int) -> List[str]:
+        """Recipes an item can fill at least one slot of, highest priority first."""
+        names = set()
+        for position in iter_bits(self._item_category_masks[item_id]):
+            names.update(self._category_recipes[position])
+        return sorted(names, key=self._recipe_ranks.__getitem__)
+
+    def _resolve_all_recipes(self) -> Dict:
+        """Resolve every recipe's ingredient categories to actual items."""
         recipes_with_ingredients = {}
+        # One list per category, shared by every recipe that uses it (views are read-only)
+        resolved: Dict[str, List[str]] = {}
         
         for name, recipe in self.recipes_data.items():
             # Resolve each ingredient category to actual items
             ingredients = {}
             for category in recipe.get("ingredients", {}).keys():
-                ingredients[category] = self.resolve_category(category)
+                if category not in resolved:
+                    resolved[category] = self.resolve_category(category)
+                ingredients[category] = resolved[category]
             
-            # Calculate total combinations
-            combinations = 1
-            for items in ingredients.values():
-                if items:
-                    combinations *= len(items)
-                else:
-                    combinations = 0
-
-            # Format display name
-            display_names = {
-                "CandyApple": "Candy Apple",
-                "HotDog": "Hot Dog",
-                "IceCream": "Ice Cream",
-                "SweetTea": "Sweet Tea",
-                "Corndog": "Corn Dog"
-            }
-            display_name = display_names.get(name, name)
+            # Distinct-item combinations; categories overlap, so not a plain product
+            combinations = count_assignments([mask for _, mask in self._recipe_slots[name]])
+
+            display_name = self.DISPLAY_NAMES.get(name, name)
 
             recipes_with_ingredients[name] = {
                 "id": recipe.get("id", ""),
@@ -171,69 +537,60 @@ class RecipeService:
         
         return recipes_with_ingredients
     
-    def get_shop_only_recipes(self) -> Dict:
-        """Get recipes that can be made with shop seeds only."""
-        all_recipes = self.get_all_recipes()
-        shop_recipes = {}
+    def _resolve_shop_only_recipes(self, all_recipes: Dict) -> Dict:
+        """Filter resolved recipes down to those makeable from shop seeds only."""
+        return self._resolve_available_recipes(all_recipes, self.shop_mask)
+
+    def _resolve_available_recipes(self, all_recipes: Dict, available: int) -> Dict:
+        """Filter resolved recipes to those makeable from the items in the ``available`` bitset."""
+        available_recipes = {}
+        resolved: Dict[int, List[str]] = {}
         
         for name, recipe in all_recipes.items():
-            # Check if all ingredient categories have at least one shop seed
-            can_make = True
-            filtered_ingredients = {}
-            
-            for category, items in recipe["ingredients"].items():
-                shop_items = [item for item in items if item in self.shop_seeds]
-                if not shop_items:
-                    can_make = False
-                    break
-                filtered_ingredients[category] = shop_items
-            
-            if can_make:
-                recipe_copy = recipe.copy()
-                recipe_copy["ingredients"] = filtered_ingredients
-                
-                # Recalculate combinations for shop-only version
-                combinations = 1
-                for items in filtered_ingredients.values():
-                    combinations *= len(items)
-                recipe_copy["combinations"] = combinations
-                
-                shop_recipes[name] = recipe_copy
-        
-        return shop_recipes
-    
-    def get_stats(self) -> Dict:
-        """Get statistics about recipes."""
-        all_recipes = self.get_all_recipes()
-        shop_recipes = self.get_shop_only_recipes()
-        
-        # Get last updated time from metadata.json
-        import json
-        metadata_file = self.data_dir / "metadata.json"
-        last_updated = None
+            # Check if all ingredient categories have at least one available item
+            slot_masks = [mask & available for _, mask in self._recipe_slots[name]]
+            if not all(slot_masks):
+                continue
+
+            recipe_copy = recipe.copy()
+            for mask in slot_masks:
+                if mask not in resolved:
+                    resolved[mask] = self._mask_to_items(mask)
+            recipe_copy["ingredients"] = {
+                category: resolved[mask]
+                for (category, _), mask in zip(self._recipe_slots[name], slot_masks)
+            }
+            # Recalculate combinations for the available items
+            recipe_copy["combinations"] = count_assignments(slot_masks)
+            available_recipes[name] = recipe_copy
         
-        if metadata_file.exists():
-            try:
-                with open(metadata_file, 'r') as f:
-                    data = json.load(f)
-                    last_updated = data.get("last_updated")
-            except Exception:
-                pass
+        return available_recipes
+
+    def _last_updated(self) -> Optional[str]:
+        """Last data update time from metadata.json, falling back to recipes.json mtime."""
+        last_updated = self.metadata.get("last_updated")
         
         # Fallback to recipes.json mtime if metadata doesn't exist (for backward compatibility)
         if not last_updated:
             recipes_file = self.data_dir / "recipes.json"
             if recipes_file.exists():
-                from datetime import datetime
                 mtime = recipes_file.stat().st_mtime
                 dt = datetime.fromtimestamp(mtime)
                 last_updated = dt.strftime("%m/%d/%Y %I:%M:%S %p")
         
-        return {
-            "total_recipes": len(all_recipes),
-            "shop_only_recipes": len(shop_recipes),
-            "last_updated": last_updated
-        }
+        return last_updated
+    
+    def get_all_recipes(self) -> Dict:
+        """Get all available recipes with their ingredient categories resolved."""
+        return self.catalog.all_recipes
+    
+    def get_shop_only_recipes(self) -> Dict:
+        """Get recipes that can be made with shop seeds only."""
+        return self.catalog.shop_recipes
+    
+    def get_stats(self) -> Dict:
+        """Get statistics about recipes."""
+        return self.catalog.stats
     
     def get_items(self) -> Dict:
         """Get all items data."""
@@ -241,3 +598,364 @@ class RecipeService:
             "shop_seeds": self.shop_seeds,
             "traits": self.traits_data
         }
+
+    RECIPE_FIELDS = ("id", "name", "image_id", "ingredients", "results", "base_time",
+                     "base_weight", "combinations", "priority")
+
+    def get_recipes_view(self, shop_only: bool = False, compact: bool = False,
+                         fields: Optional[Iterable[str]] = None,
+                         names: Optional[Iterable[str]] = None,
+                         seeds: Optional[Iterable[str]] = None):
+        """
+        Recipe list for /api/recipes with optional filtering, projection and compaction.
+
+        ``names`` keeps only the given recipes (keys or display names), ``fields``
+        keeps only the given recipe fields. ``seeds`` restricts ingredients to an
+        arbitrary seed set (e.g. today's shop stock), on top of ``shop_only``.
+
+        In compact form the result is
+        ``{"items": [...], "members": [...], "categories": {...}, "recipes": [...]}``:
+        each recipe's ``ingredients`` is a list of category names, each category
+        maps to an index into ``members``, and each distinct member set is sent
+        once as a hex bitset over the shared ``items`` table (bit ``i`` set means
+        ``items[i]``; decode with e.g. ``BigInt("0x" + hex)``). Many categories
+        resolve to the same items, and a bitset stays small after gzip where
+        index lists do not.
+        """
+        available = self.shop_mask if shop_only else -1
+        if seeds is not None:
+            available &= self._items_to_mask(seeds)
+            recipes = self._resolve_available_recipes(self.get_all_recipes(), available)
+        else:
+            recipes = self.get_shop_only_recipes() if shop_only else self.get_all_recipes()
+        if names is not None:
+            wanted = {self.find_recipe(name) for name in names}
+            selected = [recipe for key, recipe in recipes.items() if key in wanted]
+        else:
+            selected = list(recipes.values())
+        if fields is not None:
+            fields = [f for f in self.RECIPE_FIELDS if f in set(fields)]
+            selected = [{f: recipe[f] for f in fields} for recipe in selected]
+        if not compact:
+            return selected
+
+        # Shared item table (only items the selected recipes reference, sorted)
+        used = 0
+        categories: Dict[str, int] = {}
+        for recipe in selected:
+            for category in recipe.get("ingredients", {}):
+                mask = self.category_mask(category) & available
+                categories[category] = mask
+                used |= mask
+        table_ids = list(iter_bits(used))
+        table = [self.item_names[item_id] for item_id in table_ids]
+        # Re-number each distinct member set over the table, first come first numbered
+        members: Dict[int, int] = {}
+        category_members: Dict[str, int] = {}
+        for category, mask in sorted(categories.items()):
+            if mask not in members:
+                members[mask] = len(members)
+            category_members[category] = members[mask]
+        member_bits = []
+        for mask in members:
+            bits = 0
+            for position, item_id in enumerate(table_ids):
+                if mask >> item_id & 1:
+                    bits |= 1 << position
+            member_bits.append(format(bits, "x"))
+        compacted = []
+        for recipe in selected:
+            if "ingredients" in recipe:
+                recipe = dict(recipe)
+                recipe["ingredients"] = list(recipe["ingredients"])
+            compacted.append(recipe)
+        return {
+            "items": table,
+            "members": member_bits,
+            "categories": category_members,
+            "recipes": compacted,
+        }
+
+    def get_recipe(self, name: str, shop_only: bool = False) -> Optional[Dict]:
+        """Look up one resolved recipe by key or display name."""
+        key = self.find_recipe(name)
+        recipes = self.get_shop_only_recipes() if shop_only else self.get_all_recipes()
+        return recipes.get(key) if key else None
+
+    def item_categories(self, item: str) -> List[str]:
+        """All ingredient categories an item satisfies."""
+        item_id = self.item_ids.get(item)
+        if item_id is None:
+            return []
+        mask = self._item_category_masks[item_id]
+        return [cat for cat, bit in self.category_bits.items() if mask & bit]
+
+    def find_item(self, name: str) -> Optional[str]:
+        """Resolve an item name (exact or case-insensitive) to its canonical name."""
+        return name if name in self.item_ids else self._item_keys.get(name.lower())
+
+    def item_uses(self, item: str) -> Optional[Dict]:
+        """
+        What an item is good for: the categories it satisfies and the recipes it can go in.
+
+        Each recipe lists the slots (categories) the item can fill. None if the
+        item is unknown.
+        """
+        name = self.find_item(item)
+        if name is None:
+            return None
+        item_id = self.item_ids[name]
+        item_mask = self._item_category_masks[item_id]
+        recipes = []
+        for key in self._item_recipes(item_id):
+            recipe = self.recipes_data[key]
+            recipes.append({
+                "recipe": key,
+                "name": self.DISPLAY_NAMES.get(key, key),
+                "categories": [category for category, _ in self._recipe_slots[key]
+                               if item_mask & self.category_bits.get(category, 0)],
+                "priority": recipe.get("priority", 0),
+            })
+        return {
+            "item": name,
+            "traits": self.traits_data.get(name, []),
+            "shop_seed": bool(self.shop_mask >> item_id & 1),
+            "categories": self.item_categories(name),
+            "recipes": recipes,
+        }
+
+    def search(self, query: str, limit: int = 10) -> List[Dict]:
+        """Ranked prefix/fuzzy search over item and recipe names."""
+        results = []
+        for entry_id, score in self.search_index.search(query, limit):
+            kind, name = self.search_index.entries[entry_id]
+            result = {"type": kind, "name": name, "score": round(score, 4)}
+            if kind == "item":
+                result["traits"] = self.traits_data.get(name, [])
+                result["categories"] = self.item_categories(name)
+                result["shop_seed"] = bool(self.shop_mask >> self.item_ids[name] & 1)
+            else:
+                result["recipe"] = self.find_recipe(name)
+            results.append(result)
+        return results
+
+    def find_recipe(self, name: str) -> Optional[str]:
+        """Map a recipe key or display name (case-insensitive) to its recipes.json key."""
+        return self._recipe_keys.get(name.strip().lower())
+
+    def combination_lists(self, name: str, shop_only: bool = False,
+                          exclude: Iterable[str] = ()) -> Dict[str, List[str]]:
+        """
+        Resolve a recipe's categories to the item lists used for enumeration.
+
+        Lists are sorted, so the mixed-radix index of a combination is stable for a
+        given data version and filter set.
+        """
+        key = self.find_recipe(name)
+        if key is None:
+            raise KeyError(name)
+        allowed = ~self._items_to_mask(exclude)
+        if shop_only:
+            allowed &= self.shop_mask
+        return {
+            category: self._mask_to_items(self.category_mask(category) & allowed)
+            for category in self.recipes_data[key].get("ingredients", {})
+        }
+
+    def count_combinations(self, name: str, shop_only: bool = False,
+                           exclude: Iterable[str] = ()) -> int:
+        """Size of iter_combinations' index space (the product of the category sizes)."""
+        lists = self.combination_lists(name, shop_only, exclude)
+        total = 1
+        for items in lists.values():
+            total *= len(items)
+        return total
+
+    def count_recipe(self, name: str, shop_only: bool = False,
+                     exclude: Iterable[str] = ()) -> Dict:
+        """
+        Exact combination counts for a recipe.
+
+        ``product`` is the raw product of category sizes (what
+        iter_combinations enumerates), ``assignments`` counts slot assignments
+        using distinct items and ``item_sets`` counts distinct unordered sets.
+        """
+        key = self.find_recipe(name)
+        if key is None:
+            raise KeyError(name)
+        allowed = ~self._items_to_mask(exclude)
+        if shop_only:
+            allowed &= self.shop_mask
+        slot_masks = [mask & allowed for _, mask in self._recipe_slots[key]]
+        product = 1
+        for mask in slot_masks:
+            product *= bin(mask).count("1")
+        return {
+            "recipe": self.DISPLAY_NAMES.get(key, key),
+            "product": product,
+            "assignments": count_assignments(slot_masks),
+            "item_sets": count_item_sets(slot_masks),
+        }
+
+    def iter_combinations(self, name: str, start: int = 0, shop_only: bool = False,
+                          exclude: Iterable[str] = ()) -> Iterator[Tuple[int, Dict[str, str]]]:
+        """
+        Lazily yield ``(index, {category: item})`` for a recipe, starting at ``start``.
+
+        The index is a mixed-radix number over the category lists (last category
+        varies fastest), so any index can be resumed without enumerating the ones
+        before it. Indexes that would put one item in two slots are skipped, so
+        indexes run up to count_combinations (the product space) but only
+        count_recipe's ``assignments`` of them are yielded.
+        """
+        lists = self.combination_lists(name, shop_only, exclude)
+        categories = list(lists)
+        radices = [len(lists[c]) for c in categories]
+        total = 1
+        for radix in radices:
+            total *= radix
+        if not categories or start >= total:
+            return
+
+        # Decode the starting index into per-category digits
+        digits = [0] * len(categories)
+        remainder = start
+        for pos in range(len(categories) - 1, -1, -1):
+            remainder, digits[pos] = divmod(remainder, radices[pos])
+
+        index = start
+        while index < total:
+            items = [lists[c][d] for c, d in zip(categories, digits)]
+            if len(set(items)) == len(items):
+                yield index, dict(zip(categories, items))
+            index += 1
+            # Odometer increment
+            pos = len(digits) - 1
+            while pos >= 0:
+                digits[pos] += 1
+                if digits[pos] < radices[pos]:
+                    break
+                digits[pos] = 0
+                pos -= 1
+
+    def match_inventory(self, inventory: Dict[str, int]) -> Dict:
+        """
+        Find every recipe an inventory can make, with a witness assignment.
+
+        ``inventory`` maps item names to counts. Each ingredient category must be
+        filled by a distinct physical item, so each recipe is checked with a
+        bipartite matching over the precomputed category bitsets. As in the pot
+        simulator, the inventory must also hold the recipe's ingredient count.
+        """
+        capacities: Dict[int, int] = {}
+        unknown = []
+        for item, count in inventory.items():
+            item_id = self.item_ids.get(item)
+            if item_id is None:
+                unknown.append(item)
+            elif count > 0:
+                capacities[item_id] = capacities.get(item_id, 0) + count
+        total = sum(capacities.values())
+
+        matches = []
+        for name, slots in self._recipe_slots.items():
+            if not slots or total < self.required_count(name):
+                continue
+            assignment = assign_slots([mask for _, mask in slots], capacities)
+            if assignment is None:
+                continue
+            recipe = self.recipes_data[name]
+            matches.append({
+                "recipe": name,
+                "name": self.DISPLAY_NAMES.get(name, name),
+                "priority": recipe.get("priority", 0),
+                "assignment": {
+                    category: self.item_names[item_id]
+                    for (category, _), item_id in zip(slots, assignment)
+                },
+            })
+        matches.sort(key=lambda m: (-m["priority"], m["name"]))
+
+        return {"recipes": matches, "unknown_items": sorted(unknown)}
+
+    def required_count(self, name: str) -> int:
+        """Ingredients a pot needs for a recipe: one per slot, at least its ``count``."""
+        return max(len(self._recipe_slots[name]), self.recipes_data[name].get("count", 0))
+
+    def get_batch_evaluator(self):
+        """Build (once) the NumPy membership tables used for batch evaluation."""
+        if self._batch_evaluator is None:
+            # NumPy is only needed for batch jobs, so keep it off the import path
+            from backend.services.batch import BatchEvaluator
+            self._batch_evaluator = BatchEvaluator(
+                self.item_ids,
+                {name: [mask for _, mask in slots] for name, slots in self._recipe_slots.items()},
+                {name: self.required_count(name) for name in self._recipe_slots},
+            )
+        return self._batch_evaluator
+
+    def evaluate_inventories(self, inventories: List[Dict[str, int]],
+                             processes: Optional[int] = None) -> Dict:
+        """
+        Evaluate many inventories at once.
+
+        Returns, per inventory, the recipes it can make and how many times each
+        can be cooked (every slot needs its own item), plus the number of
+        inventories that can make each recipe.
+        """
+        from backend.services.batch import summarize
+        evaluator = self.get_batch_evaluator()
+        cooks = evaluator.evaluate(inventories, processes)
+        results, totals = summarize(evaluator.recipe_names, cooks)
+        return {"results": results, "recipe_totals": totals}
+
+    def simulate_cook(self, ingredients: List[str], runners_up: int = 3) -> Dict:
+        """
+        Resolve which recipe a pot with exactly these ingredients produces.
+
+        The game picks the highest-priority recipe whose categories can each be
+        filled by a distinct ingredient in the pot (and whose ingredient count the
+        pot meets); ties are broken by display name. Returns the winner plus the
+        next ``runners_up`` matching candidates.
+        """
+        capacities: Dict[int, int] = {}
+        unknown = []
+        pot_categories = 0
+        for item in ingredients:
+            item_id = self.item_ids.get(item)
+            if item_id is None:
+                unknown.append(item)
+                continue
+            capacities[item_id] = capacities.get(item_id, 0) + 1
+            pot_categories |= self._item_category_masks[item_id]
+        pot_size = sum(capacities.values())
+
+        eligible = [bucket for required, bucket in self._cook_buckets.items() if required <= pot_size]
+        candidates = []
+        for neg_priority, display_name, name, category_mask in heapq.merge(*eligible):
+            if category_mask & ~pot_categories:
+                continue
+            slots = self._recipe_slots[name]
+            assignment = assign_slots([mask for _, mask in slots], capacities)
+            if assignment is None:
+                continue
+            recipe = self.recipes_data[name]
+            candidates.append({
+                "recipe": name,
+                "name": display_name,
+                "priority": -neg_priority,
+                "base_time": recipe.get("base_time", 0),
+                "base_weight": recipe.get("base_weight", 0.0),
+                "assignment": {
+                    category: self.item_names[item_id]
+                    for (category, _), item_id in zip(slots, assignment)
+                },
+            })
+            if len(candidates) > runners_up:
+                break
+
+        return {
+            "result": candidates[0] if candidates else None,
+            "runners_up": candidates[1:],
+            "unknown_items": sorted(set(unknown)),
+        }
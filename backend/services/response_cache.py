@@ -0,0 +1,120 @@
+"""
+Cache of pre-serialized, precompressed JSON response bodies.
+"""
+import gzip
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Hashable, Optional
+
+from backend.services.metrics import RESPONSE_CACHE_EVENTS
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+
+@dataclass(frozen=True)
+class EncodedResponse:
+    """
+    One response body encoded once, with compressed copies and a strong ETag.
+
+    ``etag`` identifies the identity body; each compressed copy is a different
+    representation and gets its own tag (see ``variant_etag``). Bodies loaded
+    from a snapshot are read-only memoryviews of the mapped file, not copies.
+    """
+    body: bytes
+    gzip: Optional[bytes]
+    br: Optional[bytes]
+    etag: str
+    media_type: str = "application/json"
+
+    def variant(self, encoding: Optional[str]) -> bytes:
+        """Return the body for a content-coding ("br", "gzip" or None)."""
+        if encoding == "br" and self.br is not None:
+            return self.br
+        if encoding == "gzip" and self.gzip is not None:
+            return self.gzip
+        return self.body
+
+    def variant_etag(self, encoding: Optional[str]) -> str:
+        """Strong ETag of the body ``variant(encoding)`` returns."""
+        if encoding == "br" and self.br is not None:
+            return self.etag[:-1] + '-br"'
+        if encoding == "gzip" and self.gzip is not None:
+            return self.etag[:-1] + '-gz"'
+        return self.etag
+
+
+def encode_bytes(body: bytes, media_type: str = "application/json",
+                 compress: bool = True) -> EncodedResponse:
+    """Precompress a response body (unless ``compress`` is false) and give it a strong ETag."""
+    return EncodedResponse(
+        body=body,
+        gzip=gzip.compress(body, compresslevel=9, mtime=0) if compress else None,
+        br=brotli.compress(body, quality=11) if compress and brotli is not None else None,
+        etag='"' + hashlib.sha256(body).hexdigest()[:32] + '"',
+        media_type=media_type,
+    )
+
+
+def encode_json(payload: Any) -> EncodedResponse:
+    """Serialize a payload the way FastAPI's JSONResponse does and precompress it."""
+    body = json.dumps(payload, ensure_ascii=False, allow_nan=False,
+                      separators=(",", ":")).encode("utf-8")
+    return encode_bytes(body)
+
+
+class ResponseCache:
+    """Thread-safe LRU of EncodedResponse objects keyed by request variant."""
+
+    def __init__(self, maxsize: int = 128):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[Hashable, EncodedResponse]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[EncodedResponse]:
+        """Return the cached encoding for ``key`` without building it."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                RESPONSE_CACHE_EVENTS.inc(1, "hit")
+        return entry
+
+    def get_or_build(self, key: Hashable, build: Callable[[], Any]) -> EncodedResponse:
+        """Return the cached encoding for ``key``, building it from ``build()`` on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                RESPONSE_CACHE_EVENTS.inc(1, "hit")
+                return entry
+
+        RESPONSE_CACHE_EVENTS.inc(1, "miss")
+        # Encode outside the lock; a concurrent miss just does the same work twice
+        entry = encode_json(build())
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return entry
+
+    def put(self, key: Hashable, entry: EncodedResponse) -> None:
+        """Insert an already-encoded response (e.g. one shipped in a snapshot)."""
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
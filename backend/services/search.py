@@ -0,0 +1,113 @@
+"""
+Prefix trie plus trigram index for autocomplete over item and recipe names.
+"""
+import heapq
+from typing import Dict, List, Sequence, Set, Tuple
+
+
+def _trigrams(text: str) -> Set[str]:
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+# Ranked prefix hits kept per trie node; also the largest ``limit`` served in full
+MAX_RESULTS = 50
+
+
+def _prefix_score(name: str, query: str) -> float:
+    """Score of a name reached through the trie node for ``query``."""
+    if name == query:
+        score = 3.0
+    elif name.startswith(query):
+        score = 2.0
+    else:
+        score = 1.5  # a later word starts with the query
+    return score + len(query) / len(name)
+
+
+class SearchIndex:
+    """
+    Ranked name search built once per data version.
+
+    Every name is indexed in a character trie under the full name and under each
+    word, so "app" finds "Apple" and "Green Apple". A name's prefix score only
+    depends on the node it is reached through, so every node stores its best
+    MAX_RESULTS hits already ranked, and a prefix lookup is a walk down the
+    trie plus a slice. Queries with too few prefix hits fall back to trigram
+    overlap, which tolerates typos ("bluebery").
+    """
+
+    def __init__(self, entries: Sequence[Tuple[str, str]]):
+        """``entries`` is a sequence of (kind, name) pairs; results refer to them by position."""
+        self.entries = list(entries)
+        self._trie: Dict = {}
+        self._grams: Dict[str, List[int]] = {}
+        self._gram_counts: List[int] = []
+        for entry_id, (_, name) in enumerate(self.entries):
+            lowered = name.lower()
+            words = lowered.split()
+            for start, word in enumerate(words):
+                self._insert(" ".join(words[start:]) if start else lowered, entry_id)
+            grams = _trigrams(lowered)
+            self._gram_counts.append(len(grams))
+            for gram in grams:
+                self._grams.setdefault(gram, []).append(entry_id)
+        self._rank(self._trie, "")
+
+    def _insert(self, key: str, entry_id: int) -> None:
+        node = self._trie
+        for char in key:
+            node = node.setdefault(char, {})
+            ids = node.setdefault("", [])
+            if not ids or ids[-1] != entry_id:
+                ids.append(entry_id)
+
+    def _rank(self, root: Dict, root_prefix: str) -> None:
+        """Replace every node's id list with its top MAX_RESULTS (entry id, score) pairs."""
+        stack = [(root, root_prefix)]
+        while stack:
+            node, prefix = stack.pop()
+            for char, child in node.items():
+                if char:
+                    stack.append((child, prefix + char))
+            ids = node.get("")
+            if ids is None:
+                continue
+            scored = [(entry_id, _prefix_score(self.entries[entry_id][1].lower(), prefix))
+                      for entry_id in ids]
+            node[""] = heapq.nsmallest(MAX_RESULTS, scored,
+                                       key=lambda kv: (-kv[1], self.entries[kv[0]][1]))
+
+    def _prefix(self, query: str) -> List[Tuple[int, float]]:
+        node = self._trie
+        for char in query:
+            node = node.get(char)
+            if node is None:
+                return []
+        return node.get("", [])
+
+    def search(self, query: str, limit: int = 10) -> List[Tuple[int, float]]:
+        """Return up to ``limit`` (entry index, score) pairs (at most MAX_RESULTS), best first."""
+        query = " ".join(query.lower().split())
+        limit = min(limit, MAX_RESULTS)
+        if not query:
+            return []
+        hits = self._prefix(query)
+        if len(hits) >= limit:
+            return hits[:limit]
+
+        # Fewer hits than the node keeps, so ``hits`` is every prefix match
+        scored: Dict[int, float] = dict(hits)
+        grams = _trigrams(query)
+        overlap: Dict[int, int] = {}
+        for gram in grams:
+            for entry_id in self._grams.get(gram, ()):
+                overlap[entry_id] = overlap.get(entry_id, 0) + 1
+        for entry_id, common in overlap.items():
+            if entry_id in scored:
+                continue
+            similarity = common / (len(grams) + self._gram_counts[entry_id] - common)
+            if similarity >= 0.3:
+                scored[entry_id] = similarity
+
+        return heapq.nsmallest(limit, scored.items(), key=lambda kv: (-kv[1], self.entries[kv[0]][1]))
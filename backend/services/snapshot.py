@@ -0,0 +1,127 @@
+"""
+Compiled binary snapshot of a fully indexed dataset.
+
+Layout (little-endian)::
+
+    magic        8 bytes   b"RGSNAP\\x00\\x01"
+    format       uint32    SNAPSHOT_FORMAT
+    marshal      uint32    marshal.version of the writer
+    python       2 x uint8 major/minor of the writer (marshal is version-specific)
+    reserved     2 bytes
+    data hash    32 bytes  SHA-256 content hash of the source JSON files
+    payload len  uint64
+    payload      marshal-encoded dict of primitives (item table, bitsets, views)
+    blobs        raw byte strings, back to back (lengths in payload["blob_lengths"])
+
+The file is memory-mapped and the payload decoded straight from the mapping, so
+loading is one read with no JSON parsing or index building. Blobs are not
+decoded at all: ``read_snapshot`` returns them as read-only memoryview slices
+of the mapping, so every process that maps the file shares one copy of them in
+the page cache.
+"""
+import logging
+import marshal
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_FILE = "snapshot.bin"
+SNAPSHOT_MAGIC = b"RGSNAP\x00\x01"
+SNAPSHOT_FORMAT = 3
+HEADER = struct.Struct("<8sIIBB2x32sQ")
+
+
+def encode_snapshot(data_version: str, payload: Dict[str, Any],
+                    blobs: Sequence[bytes] = ()) -> bytes:
+    """Serialize a snapshot payload and its blobs (referenced by index) with the header."""
+    body = marshal.dumps({**payload, "blob_lengths": [len(blob) for blob in blobs]})
+    header = HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_FORMAT, marshal.version,
+                         sys.version_info[0], sys.version_info[1],
+                         bytes.fromhex(data_version), len(body))
+    return b"".join([header, body, *blobs])
+
+
+def write_snapshot(path: Path, data_version: str, payload: Dict[str, Any],
+                   blobs: Sequence[bytes] = ()) -> None:
+    """Atomically write a snapshot file (write to a temp file, then rename)."""
+    data = encode_snapshot(data_version, payload, blobs)
+    fd, tmp = tempfile.mkstemp(prefix=".snapshot-", dir=str(path.parent))
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+
+
+def read_header(buffer) -> Optional[Dict[str, Any]]:
+    """Parse and validate a snapshot header; None if it is not loadable here."""
+    if len(buffer) < HEADER.size:
+        return None
+    magic, fmt, marshal_version, major, minor, digest, length = HEADER.unpack_from(buffer, 0)
+    if magic != SNAPSHOT_MAGIC or fmt != SNAPSHOT_FORMAT:
+        return None
+    if marshal_version != marshal.version or (major, minor) != sys.version_info[:2]:
+        return None
+    if HEADER.size + length > len(buffer):
+        return None
+    return {"data_version": digest.hex(), "offset": HEADER.size, "length": length}
+
+
+def read_snapshot_version(path: Path) -> Optional[str]:
+    """Return the data hash of a snapshot file without decoding its payload."""
+    try:
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            header = read_header(mm)
+    except (OSError, ValueError):
+        return None
+    return header["data_version"] if header else None
+
+
+def read_snapshot(path: Path) -> Optional[Dict[str, Any]]:
+    """
+    Memory-map a snapshot file and decode its payload; None if missing or incompatible.
+
+    ``payload["blobs"]`` holds the blobs as memoryview slices of the mapping,
+    which stays open for as long as any of them is referenced.
+    """
+    try:
+        with open(path, "rb") as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError) as e:
+        if not isinstance(e, FileNotFoundError):
+            logger.warning(f"Failed to read snapshot {path}: {e}")
+        return None
+    blobs = []
+    try:
+        with memoryview(mm) as view:
+            header = read_header(mm)
+            if header is None:
+                logger.warning(f"Ignoring incompatible snapshot {path}")
+                return None
+            offset = header["offset"] + header["length"]
+            payload = marshal.loads(view[header["offset"]:offset])
+            for length in payload.pop("blob_lengths"):
+                if offset + length > len(mm):
+                    raise ValueError("truncated blob region")
+                blobs.append(view[offset:offset + length])
+                offset += length
+    except (ValueError, EOFError, TypeError, KeyError) as e:
+        logger.warning(f"Failed to read snapshot {path}: {e}")
+        blobs.clear()
+        return None
+    finally:
+        if not blobs:
+            mm.close()
+    payload["blobs"] = blobs
+    payload["data_version"] = header["data_version"]
+    return payload
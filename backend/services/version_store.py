@@ -0,0 +1,247 @@
+"""
+Deduplicated store of every converted dataset version.
+
+Layout under the store root (data/versions by default)::
+
+    objects/ab/ab12....json   one record (a recipe, a category's members, an
+                              item's traits, ...) named by the SHA-256 of its
+                              canonical JSON; written once, shared by versions
+    versions/<id>.json        manifest: record hashes per recipe/category/item
+    index.json                versions in the order they were added
+
+A version's ID is the first 12 hex digits of its data version (the content hash
+RecipeService computes over the source files), so converting the same data
+twice stores nothing new. Unchanged recipes and categories across versions
+point at the same object, so N versions cost far less than N JSON copies.
+
+Concurrent writers serialize on an flock of ``.lock`` in the store root.
+
+The revision numbers /api/changes uses live in a RevisionLog next to the data
+files (data/revisions.json), appended to by the converter. Servers only read
+the log and the store, so they work on read-only deployments.
+"""
+import fcntl
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from backend.services.recipe_service import RecipeService
+
+logger = logging.getLogger(__name__)
+
+VERSION_ID_LENGTH = 12
+
+
+def _canonical(record: Any) -> bytes:
+    return json.dumps(record, sort_keys=True, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _read_json_list(path: Path, cache: Dict[Path, tuple]) -> List:
+    """
+    A JSON list file, re-read only when it was replaced.
+
+    Request handlers call this on the event loop, so normally it costs one
+    stat. The result is a copy the caller may modify.
+    """
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return []
+    stamp = (st.st_ino, st.st_mtime_ns, st.st_size)
+    cached = cache.get(path)
+    if cached is None or cached[0] != stamp:
+        with open(path, "r") as f:
+            cached = (stamp, json.load(f))
+        cache[path] = cached
+    return list(cached[1])
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(prefix=".tmp-", dir=str(path.parent))
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+
+
+class VersionStore:
+    """
+    Content-addressed dataset versions, with an LRU of resident RecipeServices.
+
+    Versions are only read from disk when first requested; at most ``resident``
+    of them are kept loaded at a time.
+    """
+
+    def __init__(self, root: Path, resident: int = 4):
+        self.root = Path(root)
+        self.resident = resident
+        self._services: "OrderedDict[str, RecipeService]" = OrderedDict()
+        self._lock = threading.Lock()
+        # index.json as last read, keyed by file identity
+        self._lists: Dict[Path, tuple] = {}
+
+    def _object_path(self, digest: str) -> Path:
+        return self.root / "objects" / digest[:2] / f"{digest}.json"
+
+    def _put(self, record: Any) -> str:
+        data = _canonical(record)
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._object_path(digest)
+        if not path.exists():
+            _write_atomic(path, data)
+        return digest
+
+    def _get(self, digest: str) -> Any:
+        with open(self._object_path(digest), "rb") as f:
+            return json.load(f)
+
+    @contextmanager
+    def _write_lock(self):
+        """Exclusive lock across processes for read-modify-write of the store files."""
+        self.root.mkdir(parents=True, exist_ok=True)
+        fd = os.open(self.root / ".lock", os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            yield
+        finally:
+            os.close(fd)
+
+    def versions(self) -> List[Dict]:
+        """Summaries of the stored versions, oldest first."""
+        return _read_json_list(self.root / "index.json", self._lists)
+
+    def resolve(self, version_id: str) -> Optional[str]:
+        """Full version ID for an ID or unambiguous prefix, or None."""
+        matches = [v["id"] for v in self.versions() if v["id"].startswith(version_id)]
+        return matches[0] if len(matches) == 1 else None
+
+    def add(self, service: RecipeService) -> str:
+        """Store the dataset a service loaded; returns its version ID (existing if already stored)."""
+        version_id = service.data_version[:VERSION_ID_LENGTH]
+        if any(v["id"] == version_id for v in self.versions()):
+            return version_id
+        with self._write_lock():
+            return self._add(service, version_id)
+
+    def _add(self, service: RecipeService, version_id: str) -> str:
+        index = self.versions()
+        if any(v["id"] == version_id for v in index):
+            return version_id
+
+        manifest = {
+            "id": version_id,
+            "data_version": service.data_version,
+            "recipes": {name: self._put(recipe) for name, recipe in service.recipes_data.items()},
+            "cooking": {name: self._put(items) for name, items in service.cooking_data.items()},
+            "traits": {item: self._put(traits) for item, traits in service.traits_data.items()},
+            "shop_seeds": self._put(service.shop_seeds),
+            "metadata": self._put(service.metadata),
+            # Resolved now: the fallback (recipes.json mtime) is only right for the live data
+            "last_updated": service.catalog.stats.get("last_updated"),
+        }
+        _write_atomic(self.root / "versions" / f"{version_id}.json",
+                      json.dumps(manifest, indent=1).encode("utf-8"))
+        index.append({
+            "id": version_id,
+            "data_version": service.data_version,
+            "stored_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "last_updated": manifest["last_updated"],
+            "recipes": len(service.recipes_data),
+        })
+        _write_atomic(self.root / "index.json", json.dumps(index, indent=2).encode("utf-8"))
+        logger.info(f"Stored dataset version {version_id}")
+        return version_id
+
+    def load_sources(self, version_id: str) -> Dict[str, Any]:
+        """Reassemble a version's source data in the shape RecipeService loads from JSON."""
+        with open(self.root / "versions" / f"{version_id}.json", "r") as f:
+            manifest = json.load(f)
+        metadata = self._get(manifest["metadata"])
+        if not metadata.get("last_updated"):
+            # Older manifests lack the timestamp; the index still has metadata's
+            stored = next((v for v in self.versions() if v["id"] == version_id), {})
+            metadata = {**metadata,
+                        "last_updated": manifest.get("last_updated") or stored.get("last_updated")
+                        or stored.get("stored_at")}
+        return {
+            "recipes_data": {name: self._get(d) for name, d in manifest["recipes"].items()},
+            "cooking_data": {name: self._get(d) for name, d in manifest["cooking"].items()},
+            "traits_data": {item: self._get(d) for item, d in manifest["traits"].items()},
+            "shop_seeds": self._get(manifest["shop_seeds"]),
+            "metadata": metadata,
+            "data_version": manifest["data_version"],
+        }
+
+    def service(self, version_id: str) -> Optional[RecipeService]:
+        """RecipeService for a stored version (ID or prefix), loading it on first use."""
+        version_id = self.resolve(version_id)
+        if version_id is None:
+            return None
+        with self._lock:
+            service = self._services.get(version_id)
+            if service is not None:
+                self._services.move_to_end(version_id)
+                return service
+        # Built outside the lock; a concurrent miss may build the same version twice
+        service = RecipeService(sources=self.load_sources(version_id))
+        with self._lock:
+            self._services[version_id] = service
+            self._services.move_to_end(version_id)
+            while len(self._services) > self.resident:
+                self._services.popitem(last=False)
+        return service
+
+
+class RevisionLog:
+    """
+    Dataset versions in the order they were published; revision N is entry N (1-based).
+
+    Written only by the converter (single writer), read by every server, so
+    all processes and restarts agree on a dataset's revision. A dataset that
+    reappears later (a revert) gets a new, higher revision.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._cache: Dict[Path, tuple] = {}
+
+    def versions(self) -> List[str]:
+        """Version IDs by revision; revision N is ``versions()[N - 1]``."""
+        return _read_json_list(self.path, self._cache)
+
+    def revision_of(self, data_version: str) -> int:
+        """Latest revision of a dataset, or 0 if it was never published."""
+        version_id = data_version[:VERSION_ID_LENGTH]
+        versions = self.versions()
+        for position in range(len(versions), 0, -1):
+            if versions[position - 1] == version_id:
+                return position
+        return 0
+
+    def version_of(self, revision: int) -> Optional[str]:
+        """Version ID of a revision, or None if there is no such revision."""
+        versions = self.versions()
+        return versions[revision - 1] if 0 < revision <= len(versions) else None
+
+    def append(self, data_version: str) -> int:
+        """Publish a dataset; returns its revision (the current one if it is already latest)."""
+        versions = self.versions()
+        version_id = data_version[:VERSION_ID_LENGTH]
+        if not versions or versions[-1] != version_id:
+            versions.append(version_id)
+            _write_atomic(self.path, (json.dumps(versions, indent=1) + "\n").encode("utf-8"))
+        return len(versions)
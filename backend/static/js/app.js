@@ -1,25 +1,132 @@
 const API_URL = '/api';
+// Static bundles (backend/export_static.py) serve pre-rendered JSON files instead of the live API
+const STATIC_API = window.STATIC_API === true;
 let allRecipes = [];
+// Full dataset ({version, recipes, shopSeeds}); the shop-only view is derived from it locally
+let dataset = null;
 
-async function fetchStats() {
+const DB_NAME = 'recipe-generator';
+const DB_STORE = 'datasets';
+
+function apiUrl(endpoint) {
+    return STATIC_API ? `${API_URL}/${endpoint}.json` : `${API_URL}/${endpoint}`;
+}
+
+async function fetchJson(endpoint) {
+    const res = await fetch(apiUrl(endpoint));
+    if (!res.ok) throw new Error(`${endpoint}: HTTP ${res.status}`);
+    return res.json();
+}
+
+// IndexedDB keeps one dataset per data version, plus a pointer to the latest for offline use
+function openDb() {
+    return new Promise((resolve, reject) => {
+        const request = indexedDB.open(DB_NAME, 1);
+        request.onupgradeneeded = () => request.result.createObjectStore(DB_STORE);
+        request.onsuccess = () => resolve(request.result);
+        request.onerror = () => reject(request.error);
+    });
+}
+
+async function dbRequest(mode, action) {
+    const db = await openDb();
+    return new Promise((resolve, reject) => {
+        const tx = db.transaction(DB_STORE, mode);
+        const request = action(tx.objectStore(DB_STORE));
+        tx.oncomplete = () => { db.close(); resolve(request.result); };
+        tx.onerror = () => { db.close(); reject(tx.error); };
+    });
+}
+
+const dbGet = key => dbRequest('readonly', store => store.get(key)).catch(() => undefined);
+
+async function dbPut(data) {
     try {
-        const res = await fetch(`${API_URL}/stats`);
-        const data = await res.json();
-        const container = document.getElementById('stats-container');
-        container.innerHTML = `
-            <div class="px-3 py-1 rounded-full glass-card border-emerald-500/30 text-emerald-400">
-                <span class="font-bold text-white">${data.shop_only_recipes}</span> Recipes
-            </div>
-        `;
+        await dbRequest('readwrite', store => {
+            store.clear();
+            store.put(data, data.version);
+            return store.put(data.version, 'latest');
+        });
+    } catch (e) {
+        console.warn("Could not persist dataset", e);
+    }
+}
 
-        // Update last updated timestamp in footer
-        if (data.last_updated) {
-            const lastUpdatedEl = document.getElementById('last-updated');
-            lastUpdatedEl.textContent = `Database last updated: ${data.last_updated}`;
-        }
+function renderStats(data) {
+    const container = document.getElementById('stats-container');
+    container.innerHTML = `
+        <div class="px-3 py-1 rounded-full glass-card border-emerald-500/30 text-emerald-400">
+            <span class="font-bold text-white">${data.shop_only_recipes}</span> Recipes
+        </div>
+    `;
+
+    // Update last updated timestamp in footer
+    if (data.last_updated) {
+        const lastUpdatedEl = document.getElementById('last-updated');
+        lastUpdatedEl.textContent = `Database last updated: ${data.last_updated}`;
+    }
+}
+
+async function loadDataset() {
+    let stats = null;
+    try {
+        stats = await fetchJson('stats');
     } catch (e) {
-        console.error("Failed to fetch stats", e);
+        console.warn("Stats unavailable, using stored data", e);
+    }
+
+    const version = stats ? stats.data_version : await dbGet('latest');
+    let stored = version ? await dbGet(version) : undefined;
+    if (!stored) {
+        if (!stats) throw new Error("Offline with no stored data");
+        const [recipes, items] = await Promise.all([fetchJson('recipes'), fetchJson('items')]);
+        stored = { version: stats.data_version, recipes, shopSeeds: items.shop_seeds, stats };
+        dbPut(stored);
+    }
+    renderStats(stats || stored.stats);
+    return stored;
+}
+
+// Number of ways to fill every slot with a different item (DP over filled-slot subsets)
+function countAssignments(lists) {
+    const slotsOf = new Map();
+    lists.forEach((items, slot) => items.forEach(item => {
+        slotsOf.set(item, (slotsOf.get(item) || []).concat(slot));
+    }));
+    let ways = new Array(1 << lists.length).fill(0);
+    ways[0] = 1;
+    for (const slots of slotsOf.values()) {
+        const next = ways.slice();
+        ways.forEach((count, filled) => {
+            if (!count) return;
+            for (const slot of slots) {
+                if (!(filled & (1 << slot))) next[filled | (1 << slot)] += count;
+            }
+        });
+        ways = next;
+    }
+    return ways[ways.length - 1];
+}
+
+function shopOnlyRecipes(recipes, shopSeeds) {
+    const shop = new Set(shopSeeds);
+    const result = [];
+    for (const recipe of recipes) {
+        const ingredients = {};
+        let canMake = true;
+        for (const [category, items] of Object.entries(recipe.ingredients)) {
+            const shopItems = items.filter(item => shop.has(item));
+            if (shopItems.length === 0) {
+                canMake = false;
+                break;
+            }
+            ingredients[category] = shopItems;
+        }
+        if (canMake) {
+            result.push({ ...recipe, ingredients, combinations: countAssignments(Object.values(ingredients)) });
+        }
     }
+    return result;
 }
 
 async function fetchRecipes() {
@@ -31,8 +138,10 @@ async function fetchRecipes() {
     document.getElementById('result-container').classList.add('opacity-0', 'translate-y-4');
 
     try {
-        const res = await fetch(`${API_URL}/recipes?shop_only=${shopOnly}`);
-        allRecipes = await res.json();
+        if (!dataset) {
+            dataset = await loadDataset();
+        }
+        allRecipes = shopOnly ? shopOnlyRecipes(dataset.recipes, dataset.shopSeeds) : dataset.recipes.slice();
 
         // Sort alphabetically
         allRecipes.sort((a, b) => a.name.localeCompare(b.name));
@@ -52,8 +161,6 @@ async function fetchRecipes() {
                 select.add(option);
             });
         }
-
-        fetchStats(); // Refresh stats too
     } catch (e) {
         console.error("Failed to fetch recipes", e);
         select.innerHTML = '<option value="" disabled selected>Error loading recipes</option>';
@@ -90,28 +197,28 @@ function generateRecipe() {
     }
 
     const IMAGE_MAP = {
-        "Burger": "food_burger.webp",
-        "Soup": "food_soup.png",
-        "Corn Dog": "food_corn_dog.webp",
-        "Hot Dog": "food_hot_dog.webp",
-        "Sandwich": "food_sandwich.webp",
-        "Salad": "food_salad.webp",
-        "Pie": "food_pie.webp",
-        "Waffle": "food_waffle.webp",
-        "Pizza": "food_pizza.webp",
-        "Sushi": "food_sushi.webp",
-        "Donut": "food_donut.webp",
-        "Ice Cream": "food_ice_cream.webp",
-        "Cake": "food_cake.webp",
-        "Smoothie": "food_smoothie.webp",
-        "Porridge": "food_porridge.webp",
-        "Spaghetti": "food_spaghetti.webp",
-        "Candy Apple": "food_candy_apple.webp",
-        "Sweet Tea": "food_sweet_tea.webp"
+        "Burger": "/static/img/foods/food_burger.webp",
+        "Soup": "/static/img/foods/food_soup.png",
+        "Corn Dog": "/static/img/foods/food_corn_dog.webp",
+        "Hot Dog": "/static/img/foods/food_hot_dog.webp",
+        "Sandwich": "/static/img/foods/food_sandwich.webp",
+        "Salad": "/static/img/foods/food_salad.webp",
+        "Pie": "/static/img/foods/food_pie.webp",
+        "Waffle": "/static/img/foods/food_waffle.webp",
+        "Pizza": "/static/img/foods/food_pizza.webp",
+        "Sushi": "/static/img/foods/food_sushi.webp",
+        "Donut": "/static/img/foods/food_donut.webp",
+        "Ice Cream": "/static/img/foods/food_ice_cream.webp",
+        "Cake": "/static/img/foods/food_cake.webp",
+        "Smoothie": "/static/img/foods/food_smoothie.webp",
+        "Porridge": "/static/img/foods/food_porridge.webp",
+        "Spaghetti": "/static/img/foods/food_spaghetti.webp",
+        "Candy Apple": "/static/img/foods/food_candy_apple.webp",
+        "Sweet Tea": "/static/img/foods/food_sweet_tea.webp"
     };
 
-    const imageFile = IMAGE_MAP[recipe.name] || "";
-    const imageSrc = imageFile ? `/static/img/foods/${imageFile}` : "";
+    // Full paths so the asset build can rewrite them to content-hashed names
+    const imageSrc = IMAGE_MAP[recipe.name] || "";
     const imageHtml = imageSrc
         ? `<img src="${imageSrc}" alt="${recipe.name}" class="w-full h-full object-cover">`
         : `<span class="text-4xl">🍲</span>`;
@@ -137,7 +244,7 @@ function generateRecipe() {
                                 <img src="/static/img/emojis/cartoon_time.webp" alt="Time" class="w-5 h-5 object-contain">
                                 <span class="font-bold text-white">${formatTime(recipe.base_time)}</span>
                             </div>
-                            <div class="px-3 py-1 rounded-full glass-card border border-emerald-500/30 text-emerald-400 flex items-center gap-2 tooltip-trigger" data-tooltip="Total possible ingredient combinations for this recipe">
+                            <div class="px-3 py-1 rounded-full glass-card border border-emerald-500/30 text-emerald-400 flex items-center gap-2 tooltip-trigger" data-tooltip="Possible combinations of distinct ingredients for this recipe">
                                 <img src="/static/img/emojis/cartoon_combo.webp" alt="Combos" class="w-5 h-5 object-contain">
                                 <span class="font-bold text-white">${recipe.combinations.toLocaleString()}</span> Combos
                             </div>
@@ -159,7 +266,10 @@ function generateRecipe() {
 // Initial Load
 document.addEventListener('DOMContentLoaded', () => {
     fetchRecipes();
-    fetchStats();
+
+    if ('serviceWorker' in navigator) {
+        navigator.serviceWorker.register('/sw.js').catch(e => console.warn("Service worker not registered", e));
+    }
 
     // Add toggle animation logic
     const checkbox = document.getElementById('shop-filter');
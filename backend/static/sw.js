@@ -0,0 +1,84 @@
+// Service worker: serves the UI and API data from cache when offline and
+// revalidates cached copies with conditional requests (If-None-Match).
+const CACHE_NAME = 'recipe-generator-v1';
+const SHELL = ['/', '/static/css/styles.css', '/static/js/app.js'];
+// Every /static URL of the current build (hashed names); filled in by
+// backend/build_assets.py, empty when serving unhashed sources
+const ASSETS = [];
+
+self.addEventListener('install', event => {
+    event.waitUntil(caches.open(CACHE_NAME).then(cache => cache.addAll(SHELL)));
+    self.skipWaiting();
+});
+
+// Hashed assets from earlier builds are never requested again; drop them
+async function evictStaleAssets() {
+    if (!ASSETS.length) return;
+    const current = new Set(ASSETS);
+    const cache = await caches.open(CACHE_NAME);
+    const requests = await cache.keys();
+    await Promise.all(requests
+        .filter(request => {
+            const path = new URL(request.url).pathname;
+            return path.startsWith('/static/') && !current.has(path);
+        })
+        .map(request => cache.delete(request)));
+}
+
+self.addEventListener('activate', event => {
+    event.waitUntil(
+        caches.keys()
+            .then(keys => Promise.all(keys.filter(key => key !== CACHE_NAME).map(key => caches.delete(key))))
+            .then(evictStaleAssets)
+            .then(() => self.clients.claim())
+    );
+});
+
+// Network first with a conditional request; a 304 or a network failure falls back to the cache
+async function revalidate(request) {
+    const cache = await caches.open(CACHE_NAME);
+    const cached = await cache.match(request);
+    const etag = cached && cached.headers.get('ETag');
+    try {
+        const conditional = etag
+            ? new Request(request.url, { headers: { 'If-None-Match': etag }, credentials: request.credentials })
+            : request;
+        const response = await fetch(conditional);
+        if (response.status === 304 && cached) return cached;
+        if (response.ok) await cache.put(request, response.clone());
+        return response;
+    } catch (e) {
+        if (cached) return cached;
+        throw e;
+    }
+}
+
+// Cached copy immediately, refreshed in the background for next time
+async function staleWhileRevalidate(request) {
+    const cache = await caches.open(CACHE_NAME);
+    const cached = await cache.match(request);
+    const refresh = fetch(request)
+        .then(response => {
+            if (response.ok) cache.put(request, response.clone());
+            return response;
+        })
+        .catch(() => cached);
+    return cached || refresh;
+}
+
+self.addEventListener('fetch', event => {
+    const { request } = event;
+    const url = new URL(request.url);
+    if (request.method !== 'GET' || url.origin !== self.location.origin) return;
+
+    if (url.pathname.startsWith('/api/')) {
+        // Streaming endpoints are not worth caching
+        if (url.pathname.endsWith('/combinations')) return;
+        event.respondWith(revalidate(request));
+    } else if (request.mode === 'navigate') {
+        // Only the app shell; /docs, /metrics, /sitemap.xml etc. are real pages of their own
+        if (url.pathname === '/') event.respondWith(revalidate(new Request('/')));
+    } else if (url.pathname.startsWith('/static/')) {
+        event.respondWith(staleWhileRevalidate(request));
+    }
+});
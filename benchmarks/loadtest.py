@@ -0,0 +1,112 @@
+"""
+Concurrency load test reporting tail latency.
+
+    python -m benchmarks.loadtest --concurrency 64 --duration 10
+    python -m benchmarks.loadtest --url http://localhost:8000 --concurrency 256
+
+Without --url the app is driven in-process through httpx's ASGI transport,
+which isolates server-side head-of-line blocking from network effects. Each
+worker picks requests from a weighted mix of cheap cached reads and heavier
+computations, so a slow request blocking the event loop shows up as a p99
+spike on the cheap ones.
+"""
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+# (weight, method, path, json body)
+DEFAULT_MIX: List[Tuple[int, str, str, Optional[Dict]]] = [
+    (40, "GET", "/api/recipes", None),
+    (15, "GET", "/api/recipes?shop_only=true", None),
+    (15, "GET", "/api/stats", None),
+    (10, "GET", "/api/items/search?q=app", None),
+    (5, "GET", "/api/recipes/Sushi/combinations?limit=5000", None),
+    (5, "POST", "/api/cook/match", {"items": {"Corn": 1, "Bell Pepper": 2, "Tomato": 1}}),
+    (5, "POST", "/api/cook/simulate", {"ingredients": ["Corn", "Pepper", "Tomato"]}),
+    (5, "POST", "/api/cook/batch", {"inventories": [{"Corn": 1, "Pepper": 1}] * 500}),
+]
+
+
+def percentile(ordered: List[float], pct: float) -> float:
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+
+async def run(url: Optional[str], concurrency: int, duration: float, seed: int = 0) -> Dict:
+    import httpx
+
+    if url:
+        client = httpx.AsyncClient(base_url=url, timeout=30)
+    else:
+        from backend.main import app
+        client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://load", timeout=30)
+
+    rng = random.Random(seed)
+    weights = [w for w, *_ in DEFAULT_MIX]
+    latencies: Dict[str, List[float]] = {}
+    statuses: Dict[int, int] = {}
+    deadline = time.perf_counter() + duration
+
+    async def worker() -> None:
+        while time.perf_counter() < deadline:
+            _, method, path, body = rng.choices(DEFAULT_MIX, weights)[0]
+            t0 = time.perf_counter()
+            response = await client.request(method, path, json=body,
+                                            headers={"Accept-Encoding": "gzip"})
+            await response.aread()
+            latencies.setdefault(f"{method} {path.split('?')[0]}", []).append(time.perf_counter() - t0)
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+    async with client:
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+    every = sorted(x for samples in latencies.values() for x in samples)
+
+    def stats(samples: List[float]) -> Dict[str, float]:
+        ordered = sorted(samples)
+        return {
+            "requests": len(ordered),
+            "mean_ms": statistics.fmean(ordered) * 1e3,
+            "p50_ms": percentile(ordered, 0.50) * 1e3,
+            "p90_ms": percentile(ordered, 0.90) * 1e3,
+            "p99_ms": percentile(ordered, 0.99) * 1e3,
+            "max_ms": ordered[-1] * 1e3,
+        }
+
+    return {
+        "concurrency": concurrency,
+        "duration_s": elapsed,
+        "throughput_rps": len(every) / elapsed,
+        "statuses": statuses,
+        "overall": stats(every) if every else {},
+        "endpoints": {name: stats(samples) for name, samples in sorted(latencies.items())},
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="Target a running server instead of the in-process app")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds to run")
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args.url, args.concurrency, args.duration))
+    print(f"{report['throughput_rps']:.0f} req/s at concurrency {report['concurrency']}, "
+          f"statuses {report['statuses']}")
+    print(f"  {'endpoint':<40} {'n':>7} {'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    for name, s in [("overall", report["overall"])] + list(report["endpoints"].items()):
+        print(f"  {name:<40} {s['requests']:>7} {s['p50_ms']:>9.2f} {s['p90_ms']:>9.2f} "
+              f"{s['p99_ms']:>9.2f} {s['max_ms']:>9.2f}")
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
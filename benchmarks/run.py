@@ -0,0 +1,197 @@
+"""
+Benchmark suite for RecipeService, LuaConverter and the HTTP API.
+
+    python -m benchmarks.run --scales 1 10 100 --output bench.json
+    python -m benchmarks.run --compare old.json new.json
+
+Each scale generates a synthetic dataset (see benchmarks.synthetic) and times
+service load, category resolution, the recipe/stats views, the converter and
+end-to-end endpoint latency/throughput through an in-process ASGI client
+(requires httpx). Results are written as JSON so runs from different commits
+can be compared with --compare.
+"""
+import argparse
+import asyncio
+import json
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from backend.convert_lua_to_json import LuaConverter
+from backend.services.recipe_service import RecipeService
+from benchmarks.synthetic import generate
+
+ENDPOINTS = ["/api/recipes", "/api/recipes?shop_only=true", "/api/stats", "/api/items"]
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    ordered = sorted(samples)
+    return {
+        "runs": len(ordered),
+        "mean_s": statistics.fmean(ordered),
+        "min_s": ordered[0],
+        "p50_s": ordered[len(ordered) // 2],
+        "p95_s": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))],
+        "max_s": ordered[-1],
+    }
+
+
+def measure(fn: Callable[[], object], min_time: float = 0.2, max_runs: int = 200) -> Dict[str, float]:
+    """Time ``fn`` repeatedly (at least 3 runs, then until ``min_time`` has elapsed)."""
+    fn()  # warm-up
+    samples: List[float] = []
+    start = time.perf_counter()
+    while len(samples) < 3 or (time.perf_counter() - start < min_time and len(samples) < max_runs):
+        t0 = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t0)
+    return summarize(samples)
+
+
+async def _endpoint_benchmarks(service: RecipeService, requests: int, concurrency: int) -> Dict[str, Dict]:
+    import httpx
+    from backend.dependencies import get_recipe_service
+    from backend.main import app
+
+    app.dependency_overrides[get_recipe_service] = lambda: service
+    results = {}
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            for path in ENDPOINTS:
+                await client.get(path)  # warm the response cache
+                latencies = []
+                for _ in range(requests):
+                    t0 = time.perf_counter()
+                    await client.get(path, headers={"Accept-Encoding": "gzip"})
+                    latencies.append(time.perf_counter() - t0)
+                stats = summarize(latencies)
+
+                async def one() -> None:
+                    await client.get(path, headers={"Accept-Encoding": "gzip"})
+
+                t0 = time.perf_counter()
+                for _ in range(max(1, requests // concurrency)):
+                    await asyncio.gather(*(one() for _ in range(concurrency)))
+                elapsed = time.perf_counter() - t0
+                stats["throughput_rps"] = max(1, requests // concurrency) * concurrency / elapsed
+                stats["concurrency"] = concurrency
+                results[f"endpoint GET {path}"] = stats
+    finally:
+        app.dependency_overrides.pop(get_recipe_service, None)
+    return results
+
+
+def run_scale(scale: int, work_dir: Path, requests: int, concurrency: int,
+              endpoints: bool = True) -> Dict[str, Dict]:
+    data_dir = generate(work_dir / f"x{scale}", scale)
+    results: Dict[str, Dict] = {}
+
+    results["RecipeService load (json)"] = measure(lambda: RecipeService(str(data_dir), use_snapshot=False))
+    service = RecipeService(str(data_dir), use_snapshot=False)
+    service.write_snapshot()
+    results["RecipeService load (snapshot)"] = measure(lambda: RecipeService(str(data_dir)))
+
+    categories = sorted(service.category_masks)
+    results["resolve_category (all categories)"] = measure(
+        lambda: [service.resolve_category(c) for c in categories])
+    results["get_all_recipes"] = measure(service.get_all_recipes)
+    results["get_shop_only_recipes"] = measure(service.get_shop_only_recipes)
+    results["get_stats"] = measure(service.get_stats)
+
+    sample = service.item_names[:6]
+    results["match_inventory (6 items)"] = measure(lambda: service.match_inventory({i: 1 for i in sample}))
+    results["simulate_cook (4 items)"] = measure(lambda: service.simulate_cook(sample[:4]))
+
+    convert_dir = work_dir / f"x{scale}-convert"
+    shutil.copytree(data_dir, convert_dir, dirs_exist_ok=True)
+    results["LuaConverter.convert"] = measure(
+        lambda: _quiet(lambda: LuaConverter(str(convert_dir)).convert(force=True)), min_time=0.5, max_runs=20)
+
+    if endpoints:
+        results.update(asyncio.run(_endpoint_benchmarks(service, requests, concurrency)))
+
+    for stats in results.values():
+        stats["items"] = len(service.item_names)
+        stats["recipes"] = len(service.recipes_data)
+    return results
+
+
+def _quiet(fn: Callable[[], object]) -> object:
+    import contextlib
+    import io
+    with contextlib.redirect_stdout(io.StringIO()):
+        return fn()
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "HEAD"], text=True,
+                                       stderr=subprocess.DEVNULL).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(old_path: str, new_path: str) -> None:
+    """Print mean-time ratios (new / old) for benchmarks present in both runs."""
+    old = json.loads(Path(old_path).read_text())["results"]
+    new = json.loads(Path(new_path).read_text())["results"]
+    print(f"{'scale':>6}  {'benchmark':<45} {'old ms':>10} {'new ms':>10} {'ratio':>7}")
+    for scale, benches in new.items():
+        for name, stats in benches.items():
+            before = old.get(scale, {}).get(name)
+            if not before:
+                continue
+            ratio = stats["mean_s"] / before["mean_s"] if before["mean_s"] else float("inf")
+            flag = "  <-- slower" if ratio > 1.2 else ""
+            print(f"{scale:>6}  {name:<45} {before['mean_s'] * 1e3:>10.3f} "
+                  f"{stats['mean_s'] * 1e3:>10.3f} {ratio:>6.2f}x{flag}")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10, 100],
+                        help="Dataset multipliers to run (1000 needs several GB of RAM)")
+    parser.add_argument("--output", default="bench_output.json")
+    parser.add_argument("--requests", type=int, default=200, help="Requests per endpoint")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--no-endpoints", action="store_true", help="Skip the ASGI endpoint benchmarks")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"), help="Compare two result files")
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    report = {
+        "meta": {
+            "commit": _git_commit(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        },
+        "results": {},
+    }
+    with tempfile.TemporaryDirectory(prefix="recipe-bench-") as tmp:
+        for scale in args.scales:
+            print(f"== scale x{scale}")
+            results = _quiet(lambda: run_scale(scale, Path(tmp), args.requests, args.concurrency,
+                                               endpoints=not args.no_endpoints))
+            report["results"][str(scale)] = results
+            for name, stats in results.items():
+                extra = f"  {stats['throughput_rps']:.0f} req/s" if "throughput_rps" in stats else ""
+                print(f"  {name:<45} mean {stats['mean_s'] * 1e3:9.3f} ms  "
+                      f"p95 {stats['p95_s'] * 1e3:9.3f} ms{extra}")
+
+    Path(args.output).write_text(json.dumps(report, indent=2))
+    print(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Synthetic dataset generator for benchmarks.
+
+Produces a data directory shaped like ``data/`` but ``scale`` times larger:
+plant_traits.json, shopseeds.json, metadata.json and a FoodRecipeData.lua dump,
+from which LuaConverter derives recipes.json and cooking.json.
+
+    python -m benchmarks.synthetic 100 /tmp/recipes-x100
+"""
+import argparse
+import json
+import random
+from pathlib import Path
+from typing import Dict, List
+
+from backend.convert_lua_to_json import LuaConverter
+
+REAL_DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+
+# Cooking-category variables the converter maps by name (see LuaConverter)
+FIXED_CATEGORY_VARS = {"Bread": "v5", "Meat": "v6", "Leafy": "v7", "Pastry": "v8", "Tomato": "v9"}
+TRAIT_CATEGORIES = {
+    "Fruit": "Fruit", "Vegetable": "Vegetable", "Sweet": "Sweet", "Sauce": "Fruit",
+    "Cream": "Sweet", "Stick": "Woody", "Icing": "Sweet", "Sprinkles": "Sweet",
+    "CandyCoating": "Sweet", "Sweetener": "Sweet",
+}
+
+
+def _lua_list(items: List[str]) -> str:
+    return "{\n" + ",\n".join(f'\t"{item}"' for item in items) + "\n}"
+
+
+def generate(out_dir: Path, scale: int, seed: int = 0) -> Path:
+    """Write a dataset ``scale`` times the size of data/ into ``out_dir``."""
+    rng = random.Random(seed)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    real_traits: Dict[str, List[str]] = json.loads((REAL_DATA_DIR / "plant_traits.json").read_text())
+    real_cooking: Dict[str, List[str]] = json.loads((REAL_DATA_DIR / "cooking.json").read_text())
+    real_recipes: Dict[str, Dict] = json.loads((REAL_DATA_DIR / "recipes.json").read_text())
+    real_shop = json.loads((REAL_DATA_DIR / "shopseeds.json").read_text())["shopseeds"]
+
+    # Items: real plants plus numbered copies that reuse a real plant's trait list
+    trait_lists = list(real_traits.values())
+    traits = dict(real_traits)
+    for i in range(len(real_traits) * (scale - 1)):
+        traits[f"Plant {i:07d}"] = rng.choice(trait_lists)
+    names = list(traits)
+    (out_dir / "plant_traits.json").write_text(json.dumps(traits, indent=2))
+
+    shop = real_shop + rng.sample(names, min(len(names), len(real_shop) * (scale - 1)))
+    (out_dir / "shopseeds.json").write_text(json.dumps({"shopseeds": shop}, indent=2))
+    (out_dir / "metadata.json").write_text(json.dumps({"last_updated": "01/01/2026 12:00:00 AM"}))
+
+    # Lua dump: scaled fixed category lists, then scale x the real recipes
+    lines = [
+        "local v1 = game:GetService(\"ReplicatedStorage\")",
+        "local v2 = require(v1.Modules.PlantTraitsData)",
+        "local v3 = require(v1.Modules.TableUtils)",
+        "local v4 = {}",
+    ]
+    for category, var in FIXED_CATEGORY_VARS.items():
+        items = real_cooking.get(category, []) + rng.sample(names, len(real_cooking.get(category, [])) * (scale - 1))
+        lines.append(f"local {var} = {_lua_list(items)}")
+    lines.append("local v10 = {}")
+
+    var_id = 100
+    recipe_templates = list(real_recipes.items())
+    for copy in range(scale):
+        for name, recipe in recipe_templates:
+            recipe_name = name if copy == 0 else f"{name}{copy}"
+            recipe_id = recipe["id"] if copy == 0 else f'{recipe["id"]}{copy}'
+            priority = recipe["priority"] if copy == 0 else rng.randint(0, 20)
+            ingredients = []
+            for category in recipe["ingredients"]:
+                if category in FIXED_CATEGORY_VARS:
+                    ref = FIXED_CATEGORY_VARS[category]
+                elif category in TRAIT_CATEGORIES:
+                    ref = f"v2.Traits.{TRAIT_CATEGORIES[category]}"
+                elif category in ("Filling", "Main"):
+                    ref = "v3:MakeTable(v2.Traits.Vegetable, v6)"
+                elif category == "HerbalBase":
+                    ref = "v3:MakeTable(v3:SetSubtract(v2.Traits.Flower, v2.Traits.Toxic), \"Mint\")"
+                elif category == "Any":
+                    continue
+                else:
+                    ref = "v5"
+                ingredients.append(f'\t\t["{category}"] = {ref}')
+            requires = f'\t["Requires"] = {{\n\t\t["Count"] = {recipe["count"]}'
+            if ingredients:
+                requires += ',\n\t\t["Ingredients"] = {\n' + ",\n".join("\t" + i for i in ingredients) + "\n\t\t}"
+            requires += "\n\t}"
+            lines.append(
+                f"local v{var_id} = {{\n"
+                f'\t["Id"] = "{recipe_id}",\n'
+                f'\t["ImageId"] = "{recipe["image_id"]}",\n'
+                f'\t["Priority"] = {priority},\n'
+                f"{requires},\n"
+                f'\t["Results"] = {{ "{recipe_name}" }},\n'
+                f'\t["BaseTime"] = {recipe["base_time"]},\n'
+                f'\t["BaseWeight"] = {recipe["base_weight"]}\n'
+                "}"
+            )
+            lines.append(f"v10.{recipe_name} = v{var_id}")
+            var_id += 1
+    lines += ["v4.Recipes = v10", "return v4"]
+    (out_dir / "FoodRecipeData.lua").write_text("\n".join(lines) + "\n")
+
+    LuaConverter(str(out_dir)).convert(force=True)
+    return out_dir
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a scaled synthetic dataset")
+    parser.add_argument("scale", type=int, help="Size multiplier relative to data/ (e.g. 10, 100, 1000)")
+    parser.add_argument("out_dir")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    generate(Path(args.out_dir), args.scale, args.seed)
@@ -0,0 +1,77 @@
+import random
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from backend.services.batch import BatchEvaluator
+from backend.services.recipe_service import RecipeService
+
+
+def brute_force_cooks(slot_masks, counts, required):
+    """Cook one assignment of distinct units at a time, trying every choice, as often as possible."""
+    def fill(slot, left):
+        if slot == len(slot_masks):
+            return [left]
+        options = []
+        for item, count in enumerate(left):
+            if count and slot_masks[slot] >> item & 1:
+                after = list(left)
+                after[item] -= 1
+                options += fill(slot + 1, after)
+        return options
+
+    def best(left, cooks):
+        # Each cook also takes spare units up to ``required``, from whatever is left
+        if sum(counts) < (cooks + 1) * required:
+            return cooks
+        return max((best(after, cooks + 1) for after in fill(0, left)), default=cooks)
+
+    return best(counts, 0)
+
+
+@pytest.mark.parametrize("seed", range(150))
+def test_max_cooks_match_brute_force(seed):
+    rng = random.Random(seed)
+    universe = rng.randint(1, 5)
+    slots = [rng.getrandbits(universe) | 1 << rng.randrange(universe) for _ in range(rng.randint(1, 3))]
+    required = rng.choice([0, len(slots) + rng.randint(0, 2)])
+    counts = [rng.randint(0, 3) for _ in range(universe)]
+    evaluator = BatchEvaluator({str(i): i for i in range(universe)}, {"r": slots}, {"r": required})
+    inventory = {str(i): count for i, count in enumerate(counts)}
+    expected = brute_force_cooks(slots, counts, max(len(slots), required))
+    assert evaluator.evaluate([inventory])[0, 0] == expected
+
+
+def test_shared_groups_keep_their_own_required_count():
+    slots = [0b01, 0b10]
+    evaluator = BatchEvaluator({"a": 0, "b": 1}, {"pair": slots, "stew": slots, "empty": []},
+                               {"stew": 4})
+    assert evaluator.recipe_names == ["pair", "stew"]
+    cooks = evaluator.evaluate([{"a": 3, "b": 3}, {"a": 1, "b": 2}, {"a": 5}])
+    assert cooks.tolist() == [[3, 1], [1, 0], [0, 0]]
+
+
+def test_unknown_items_and_empty_counts_are_ignored():
+    evaluator = BatchEvaluator({"a": 0}, {"r": [0b1]})
+    encoded = evaluator.encode([{"a": 2, "ghost": 5}, {"a": 0}, {"a": -1}])
+    assert encoded.size == 3
+    assert encoded.rows.tolist() == [0]
+    assert evaluator.max_cooks(encoded).tolist() == [[2], [0], [0]]
+    assert evaluator.evaluate([]).shape == (0, 1)
+
+
+def test_batch_agrees_with_match_inventory():
+    service = RecipeService(use_snapshot=False)
+    rng = random.Random(0)
+    items = list(service.item_names)
+    inventories = [
+        {item: rng.randint(1, 3) for item in rng.sample(items, rng.randint(1, 8))}
+        for _ in range(300)
+    ]
+    evaluator = service.get_batch_evaluator()
+    cooks = evaluator.evaluate(inventories, processes=1)
+    for inventory, row in zip(inventories, cooks):
+        cookable = {name for name, count in zip(evaluator.recipe_names, row) if count}
+        matched = {match["recipe"] for match in service.match_inventory(inventory)["recipes"]}
+        assert cookable == matched
@@ -0,0 +1,61 @@
+import shutil
+from pathlib import Path
+
+import pytest
+
+from backend.convert_lua_to_json import LuaConverter, LuaTableEvaluator, Opaque, tokenize
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+
+
+def test_tokenize_skips_comments_and_marks_keywords():
+    source = '--[==[ long\ncomment ]==]\nlocal x = {"a", 0x1F, 2.5e1} -- trailing'
+    assert list(tokenize(source)) == [
+        ("keyword", "local"), ("name", "x"), ("op", "="), ("op", "{"),
+        ("string", '"a"'), ("op", ","), ("number", "0x1F"), ("op", ","),
+        ("number", "2.5e1"), ("op", "}"), ("eof", ""),
+    ]
+
+
+def test_tokenize_rejects_unknown_characters():
+    with pytest.raises(SyntaxError):
+        list(tokenize("local x = @"))
+
+
+def test_evaluator_builds_nested_tables_and_unquotes_strings():
+    variables = LuaTableEvaluator({}).run(
+        'local t = {Name = "Burger", ["Key"] = \'it\\\'s\', List = {"a", "b"}, Empty = {}}'
+    )
+    assert variables["t"] == {"Name": "Burger", "Key": "it's", "List": ["a", "b"], "Empty": {}}
+
+
+def test_evaluator_resolves_traits_and_table_helpers():
+    source = """
+        local Traits = require(game.ReplicatedStorage.PlantTraitsData)
+        local TableUtils = require(game.ReplicatedStorage.TableUtils)
+        local fruit = Traits.Traits.Fruit
+        local both = TableUtils:MakeTable(fruit, {"Carrot", "Apple"})
+        local rest = TableUtils:SetSubtract(both, {"Apple"})
+        for i = 1, 10 do local ignored = {} end
+        local function helper() return {} end
+        return {Recipes = {Soup = {Requires = {Count = 1}}}}
+    """
+    evaluator = LuaTableEvaluator({"Fruit": ["Apple", "Banana"]})
+    variables = evaluator.run(source)
+    assert isinstance(variables["Traits"], Opaque)
+    assert variables["fruit"] == ["Apple", "Banana"]
+    assert variables["both"] == ["Apple", "Banana", "Carrot"]
+    assert variables["rest"] == ["Banana", "Carrot"]
+    assert "ignored" not in variables and "helper" not in variables
+    assert evaluator.returned == {"Recipes": {"Soup": {"Requires": {"Count": 1}}}}
+
+
+def test_conversion_reproduces_committed_json(tmp_path):
+    for name in ("FoodRecipeData.lua", "plant_traits.json"):
+        shutil.copyfile(DATA_DIR / name, tmp_path / name)
+    converter = LuaConverter(str(tmp_path))
+    assert converter.convert() is True
+    for name in ("recipes.json", "cooking.json"):
+        assert (tmp_path / name).read_bytes() == (DATA_DIR / name).read_bytes()
+    # Unchanged sources are skipped on the next run
+    assert LuaConverter(str(tmp_path)).convert() is False
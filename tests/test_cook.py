@@ -0,0 +1,69 @@
+import random
+
+import pytest
+
+from backend.services.matching import assign_slots
+from backend.services.recipe_service import RecipeService
+
+
+@pytest.fixture(scope="module")
+def service():
+    return RecipeService(use_snapshot=False)
+
+
+def reference_candidates(service, ingredients):
+    """Every recipe the pot satisfies, checked one by one and sorted like the game."""
+    capacities = {}
+    for item in ingredients:
+        if item in service.item_ids:
+            capacities[service.item_ids[item]] = capacities.get(service.item_ids[item], 0) + 1
+    matches = []
+    for name, slots in service._recipe_slots.items():
+        if not slots or sum(capacities.values()) < service.required_count(name):
+            continue
+        if assign_slots([mask for _, mask in slots], capacities) is not None:
+            recipe = service.recipes_data[name]
+            matches.append((-recipe.get("priority", 0), service.DISPLAY_NAMES.get(name, name), name))
+    return [name for _, _, name in sorted(matches)]
+
+
+def test_simulator_matches_reference(service):
+    rng = random.Random(0)
+    items = list(service.item_names)
+    for _ in range(500):
+        pot = [rng.choice(items) for _ in range(rng.randint(1, 5))]
+        result = service.simulate_cook(pot, runners_up=3)
+        candidates = [result["result"]] + result["runners_up"] if result["result"] else []
+        assert [c["recipe"] for c in candidates] == reference_candidates(service, pot)[:4]
+        for candidate in candidates:
+            # The witness uses each pot unit at most once
+            used = list(candidate["assignment"].values())
+            assert all(used.count(item) <= pot.count(item) for item in used)
+
+
+def test_buckets_are_keyed_by_required_count_and_sorted(service):
+    for required, bucket in service._cook_buckets.items():
+        assert bucket == sorted(bucket)
+        assert all(service.required_count(name) == required for _, _, name, _ in bucket)
+    assert sum(map(len, service._cook_buckets.values())) == len(service.recipes_data)
+
+
+def test_ingredient_count_is_enforced(service):
+    fruit = service.resolve_category("Fruit")[0]
+    # Smoothie has one Fruit slot but takes two ingredients
+    assert service.required_count("Smoothie") == 2
+    single = service.simulate_cook([fruit], runners_up=20)
+    assert "Smoothie" not in [c["recipe"] for c in [single["result"]] + single["runners_up"]]
+    double = service.simulate_cook([fruit, fruit], runners_up=20)
+    assert "Smoothie" in [c["recipe"] for c in [double["result"]] + double["runners_up"]]
+
+
+def test_higher_priority_wins_and_unknown_items_do_not_count(service):
+    fruit = service.resolve_category("Fruit")[0]
+    result = service.simulate_cook([fruit, fruit, "Not A Plant"])
+    assert result["unknown_items"] == ["Not A Plant"]
+    priorities = [c["priority"] for c in [result["result"]] + result["runners_up"]]
+    assert priorities == sorted(priorities, reverse=True)
+    assert service.simulate_cook(["Not A Plant"]) == {
+        "result": None, "runners_up": [], "unknown_items": ["Not A Plant"],
+    }
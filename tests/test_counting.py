@@ -0,0 +1,55 @@
+import itertools
+import random
+
+import pytest
+
+from backend.services.counting import count_assignments, count_item_sets
+from backend.services.recipe_service import RecipeService
+
+
+def brute_force(slot_masks, universe):
+    items = [[i for i in range(universe) if mask >> i & 1] for mask in slot_masks]
+    distinct = [combo for combo in itertools.product(*items) if len(set(combo)) == len(combo)]
+    return len(distinct), len({frozenset(combo) for combo in distinct})
+
+
+@pytest.mark.parametrize("seed", range(200))
+def test_counts_match_brute_force(seed):
+    rng = random.Random(seed)
+    universe = rng.randint(1, 9)
+    slot_masks = [rng.getrandbits(universe) for _ in range(rng.randint(1, 4))]
+    assert (count_assignments(slot_masks), count_item_sets(slot_masks)) == brute_force(slot_masks, universe)
+
+
+def test_counts_of_no_slots_and_empty_slots():
+    assert count_assignments([]) == count_item_sets([]) == 1
+    assert count_assignments([0b11, 0]) == count_item_sets([0b11, 0]) == 0
+
+
+def test_large_categories_are_exact():
+    everything = (1 << 500) - 1
+    # 500 * 499 * 498 ordered picks of distinct items, C(500, 3) unordered
+    assert count_assignments([everything] * 3) == 500 * 499 * 498
+    assert count_item_sets([everything] * 3) == 500 * 499 * 498 // 6
+
+
+def test_count_recipe_matches_enumeration():
+    service = RecipeService(use_snapshot=False)
+    for name in service.recipes_data:
+        counts = service.count_recipe(name, shop_only=True)
+        indexed = list(service.iter_combinations(name, shop_only=True))
+        combos = [c for _, c in indexed]
+        assert all(len(set(c.values())) == len(c) for c in combos)
+        assert all(index < counts["product"] for index, _ in indexed)
+        assert counts["assignments"] == len(combos)
+        assert counts["item_sets"] == len({frozenset(c.values()) for c in combos})
+
+
+def test_iter_combinations_resumes_at_any_index():
+    service = RecipeService(use_snapshot=False)
+    indexed = list(service.iter_combinations("Burger"))
+    for position in (0, 1, len(indexed) // 2, len(indexed) - 1):
+        index = indexed[position][0]
+        assert list(service.iter_combinations("Burger", start=index)) == indexed[position:]
+        # Starting between yielded indexes resumes at the next distinct combination
+        assert list(service.iter_combinations("Burger", start=index + 1)) == indexed[position + 1:]
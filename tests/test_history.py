@@ -0,0 +1,130 @@
+import copy
+
+import pytest
+
+from backend.services.history import DatasetHistory, dataset_state, diff_states
+from backend.services.recipe_service import RecipeService
+from backend.services.version_store import RevisionLog, VersionStore
+
+
+@pytest.fixture(scope="module")
+def base():
+    return RecipeService(use_snapshot=False)
+
+
+@pytest.fixture(scope="module")
+def edited(base):
+    """The base dataset with a recipe changed and removed, a category member and a shop seed dropped."""
+    recipes = copy.deepcopy(base.recipes_data)
+    recipes["Burger"]["priority"] += 1
+    del recipes["Soup"]
+    cooking = copy.deepcopy(base.cooking_data)
+    dropped = cooking["Bread"].pop(0)
+    sources = {
+        "recipes_data": recipes,
+        "cooking_data": cooking,
+        "traits_data": base.traits_data,
+        "shop_seeds": [seed for seed in base.shop_seeds if seed != dropped] + ["New Seed"],
+        "metadata": base.metadata,
+        "data_version": "e" * 64,
+    }
+    return RecipeService(sources=sources)
+
+
+def test_diff_states_sections():
+    old = {
+        "recipes": {"a": {"priority": 1}, "b": {"priority": 2}},
+        "categories": {"Fruit": ["x", "y"]},
+        "traits": {"Sweet": ["x"]},
+        "shop_seeds": {"x": True, "y": True},
+    }
+    new = {
+        "recipes": {"a": {"priority": 5}, "c": {"priority": 3}},
+        "categories": {"Fruit": ["y", "z"], "Veg": ["w"]},
+        "traits": {"Sweet": ["x"]},
+        "shop_seeds": {"y": True, "z": True},
+    }
+    delta = diff_states(old, new)
+    assert delta["recipes"] == {"added": {"c": {"priority": 3}}, "removed": ["b"],
+                                "changed": {"a": {"priority": 5}}}
+    assert delta["categories"] == {"added": {"Veg": ["w"]}, "removed": [],
+                                   "changed": {"Fruit": {"added": ["z"], "removed": ["x"]}}}
+    assert delta["traits"] == {"added": {}, "removed": [], "changed": {}}
+    assert delta["shop_seeds"] == {"added": ["z"], "removed": ["x"]}
+    assert diff_states(new, new)["recipes"] == {"added": {}, "removed": [], "changed": {}}
+
+
+def test_diff_from_nothing_adds_everything(base):
+    state = dataset_state(base)
+    delta = diff_states({}, state)
+    assert delta["recipes"]["added"] == state["recipes"]
+    assert delta["shop_seeds"] == {"added": list(base.shop_seeds), "removed": []}
+
+
+def test_changes_between_logged_revisions(tmp_path, base, edited):
+    log = RevisionLog(tmp_path / "revisions.json")
+    assert log.append(base.data_version) == 1
+    assert log.append(base.data_version) == 1
+    assert log.append(edited.data_version) == 2
+    history = DatasetHistory(log=log)
+    first, second = copy.copy(base), copy.copy(edited)
+    assert history.record(first) == 1 and history.record(second) == 2
+
+    delta = history.changes(1, second)
+    assert (delta["since"], delta["revision"], delta["reset"]) == (1, 2, False)
+    assert delta["recipes"]["removed"] == ["Soup"]
+    # Burger changed itself; the others resolve a category that lost the dropped item
+    old_recipes, new_recipes = base.get_all_recipes(), edited.get_all_recipes()
+    assert set(delta["recipes"]["changed"]) == {
+        name for name, recipe in new_recipes.items() if old_recipes[name] != recipe
+    }
+    assert delta["recipes"]["changed"]["Burger"]["priority"] == edited.recipes_data["Burger"]["priority"]
+    assert delta["shop_seeds"]["added"] == ["New Seed"]
+    assert delta["categories"]["changed"]["Bread"]["removed"] == [base.cooking_data["Bread"][0]]
+
+    current = history.changes(2, second)
+    assert not current["reset"] and current["recipes"]["changed"] == {}
+
+
+@pytest.mark.parametrize("since", [None, 0, 3, 99])
+def test_unknown_since_is_a_reset(tmp_path, base, edited, since):
+    log = RevisionLog(tmp_path / "revisions.json")
+    log.append(base.data_version)
+    log.append(edited.data_version)
+    history = DatasetHistory(log=log)
+    service = copy.copy(edited)
+    history.record(service)
+    delta = history.changes(since, service)
+    assert delta["reset"] and delta["since"] is None
+    assert delta["recipes"]["added"] == service.get_all_recipes()
+
+
+def test_evicted_revision_resets_without_store_and_diffs_with_one(tmp_path, base, edited):
+    log = RevisionLog(tmp_path / "revisions.json")
+    log.append(base.data_version)
+    log.append(edited.data_version)
+    service = copy.copy(edited)
+    history = DatasetHistory(maxsize=1, log=log)
+    history.record(copy.copy(base))
+    history.record(service)
+    assert not history.known(1, service)
+    assert history.changes(1, service)["reset"]
+
+    store = VersionStore(tmp_path / "versions")
+    store.add(base)
+    stored = DatasetHistory(maxsize=1, store=store, log=log)
+    stored.record(service)
+    assert stored.known(1, service)
+    delta = stored.changes(1, service)
+    assert not delta["reset"] and delta["recipes"]["removed"] == ["Soup"]
+
+
+def test_dataset_missing_from_log_is_revision_zero(tmp_path, edited):
+    log = RevisionLog(tmp_path / "revisions.json")
+    history = DatasetHistory(log=log)
+    service = copy.copy(edited)
+    assert history.record(service) == 0
+    assert not history.known(0, service) and history.changes(0, service)["reset"]
+    # Once the converter publishes it, the next lookup picks the revision up
+    log.append(service.data_version)
+    assert history.record(service) == 1
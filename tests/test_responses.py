@@ -0,0 +1,77 @@
+import pytest
+from starlette.requests import Request
+
+from backend.responses import _byte_range, encoded_response
+from backend.services.response_cache import encode_bytes
+
+
+@pytest.mark.parametrize("header, expected", [
+    (None, None),
+    ("", None),
+    ("bytes=0-3", (0, 3)),
+    ("bytes=4-", (4, 9)),
+    ("bytes=7-100", (7, 9)),
+    ("bytes=-3", (7, 9)),
+    ("bytes=-100", (0, 9)),
+    ("BYTES = 2-2", (2, 2)),
+    # Unsatisfiable: valid but outside the body
+    ("bytes=10-", (10, 10)),
+    ("bytes=12-15", (10, 10)),
+    ("bytes=-0", (10, 10)),
+    # Ignored: another unit, several ranges or not a valid range-spec
+    ("items=0-3", None),
+    ("bytes=0-1,4-5", None),
+    ("bytes=5-3", None),
+    ("bytes=5", None),
+    ("bytes=a-3", None),
+    ("bytes=-", None),
+])
+def test_byte_range(header, expected):
+    assert _byte_range(header, 10) == expected
+
+
+ENCODED = encode_bytes(b"0123456789", media_type="text/plain", compress=False)
+
+
+def request(method="GET", **headers):
+    return Request({
+        "type": "http", "method": method, "path": "/", "query_string": b"",
+        "headers": [(name.replace("_", "-").encode(), value.encode()) for name, value in headers.items()],
+    })
+
+
+def test_single_range_is_partial_content():
+    response = encoded_response(request(range="bytes=2-4"), ENCODED, ranges=True)
+    assert response.status_code == 206
+    assert bytes(response.body) == b"234"
+    assert response.headers["content-range"] == "bytes 2-4/10"
+    assert response.headers["accept-ranges"] == "bytes"
+
+
+def test_invalid_and_disabled_ranges_send_everything():
+    for response in (encoded_response(request(range="bytes=5-3"), ENCODED, ranges=True),
+                     encoded_response(request(range="bytes=2-4"), ENCODED)):
+        assert response.status_code == 200
+        assert bytes(response.body) == b"0123456789"
+        assert "content-range" not in response.headers
+
+
+def test_unsatisfiable_range():
+    response = encoded_response(request(range="bytes=20-"), ENCODED, ranges=True)
+    assert response.status_code == 416
+    assert response.headers["content-range"] == "bytes */10"
+
+
+def test_if_range_guards_the_range():
+    matching = encoded_response(request(range="bytes=0-0", if_range=ENCODED.etag), ENCODED, ranges=True)
+    assert matching.status_code == 206 and bytes(matching.body) == b"0"
+    stale = encoded_response(request(range="bytes=0-0", if_range='"stale"'), ENCODED, ranges=True)
+    assert stale.status_code == 200 and bytes(stale.body) == b"0123456789"
+
+
+def test_head_and_not_modified():
+    head = encoded_response(request("HEAD", range="bytes=0-3"), ENCODED, ranges=True)
+    assert head.status_code == 206 and head.body == b""
+    assert head.headers["content-length"] == "4"
+    cached = encoded_response(request(if_none_match=ENCODED.etag, range="bytes=0-3"), ENCODED, ranges=True)
+    assert cached.status_code == 304
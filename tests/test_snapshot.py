@@ -0,0 +1,32 @@
+from backend.services.recipe_service import RecipeService
+from backend.services.snapshot import read_snapshot, write_snapshot
+
+
+def test_blobs_are_views_of_the_mapping(tmp_path):
+    path = tmp_path / "snapshot.bin"
+    write_snapshot(path, "ab" * 32, {"answer": 42}, [b"first", b"", b"third"])
+    payload = read_snapshot(path)
+    assert payload["answer"] == 42
+    assert payload["data_version"] == "ab" * 32
+    assert all(isinstance(blob, memoryview) for blob in payload["blobs"])
+    assert [bytes(blob) for blob in payload["blobs"]] == [b"first", b"", b"third"]
+
+
+def test_truncated_blob_region_is_rejected(tmp_path):
+    path = tmp_path / "snapshot.bin"
+    write_snapshot(path, "ab" * 32, {}, [b"0123456789"])
+    path.write_bytes(path.read_bytes()[:-1])
+    assert read_snapshot(path) is None
+
+
+def test_attached_service_serves_shipped_responses(tmp_path):
+    loader = RecipeService(use_snapshot=False)
+    path = loader.write_snapshot(tmp_path / "snapshot.bin", include_responses=True)
+    follower = RecipeService(snapshot_path=path)
+    assert follower.catalog.all_recipes == loader.catalog.all_recipes
+    for key, encoded in loader.warm_response_cache().items():
+        shipped = follower.response_cache.get((follower.data_version, key))
+        assert isinstance(shipped.body, memoryview)
+        assert shipped.etag == encoded.etag
+        for encoding in ("br", "gzip", None):
+            assert bytes(shipped.variant(encoding)) == bytes(encoded.variant(encoding))